@@ -0,0 +1,38 @@
+import timeit
+from datetime import datetime
+
+from event.dates import parse_server, clear_cache, SERVER_FORMAT
+
+
+def make_values(n: int, distinct: int) -> list:
+    values = [f'2099-{1 + i % 12:02d}-{1 + i % 28:02d}T{i % 24:02d}:{i % 60:02d}:00Z' for i in range(distinct)]
+    return values * (n // distinct)
+
+
+def strptime(values: list) -> list:
+    return [datetime.strptime(value, SERVER_FORMAT) for value in values]
+
+
+def codec(values: list) -> list:
+    clear_cache()
+    return [parse_server(value) for value in values]
+
+
+def uncached(values: list) -> list:
+    parse = parse_server.__wrapped__
+    return [parse(value) for value in values]
+
+
+def main(n: int = 10000, distinct: int = 100, repeat: int = 3) -> dict:
+    values = make_values(n, distinct)
+    assert strptime(values) == codec(values) == uncached(values)
+    res = {name: min(timeit.repeat(lambda: parse(values), number=1, repeat=repeat))
+           for name, parse in (('strptime', strptime), ('uncached', uncached), ('cached', codec))}
+    print(f'{len(values)} dates ({distinct} distinct): ' +
+          ', '.join(f'{name} {elapsed * 1000:.1f} ms' for name, elapsed in res.items()) +
+          f', speedup x{res["strptime"] / res["cached"]:.1f}')
+    return res
+
+
+if __name__ == '__main__':
+    main()
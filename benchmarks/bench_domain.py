@@ -0,0 +1,35 @@
+import timeit
+from datetime import datetime
+
+from event.domain import Name, Description, Author, Date, Location, Category, Priority, Event
+
+
+def make_rows(n: int) -> list:
+    return [{'id': i, 'name': f'Evento {i}', 'description': 'partita di calcetto', 'author': 1,
+             'start_date': '2099-12-25T12:12:12Z', 'end_date': '2099-12-26T12:12:12Z',
+             'location': 'stadio', 'category': i % 4, 'priority': i % 3} for i in range(n)]
+
+
+def per_field(rows: list) -> list:
+    return [Event(int(item['id']), Name(item['name']), Description(item['description']), Author(item['author']),
+                  Date(datetime.strptime(item['start_date'], '%Y-%m-%dT%H:%M:%SZ')),
+                  Date(datetime.strptime(item['end_date'], '%Y-%m-%dT%H:%M:%SZ')),
+                  Location(item['location']), Category(item['category']), Priority(item['priority']))
+            for item in rows]
+
+
+def bulk(rows: list) -> list:
+    return Event.from_rows(rows)
+
+
+def main(n: int = 1000, repeat: int = 3) -> dict:
+    rows = make_rows(n)
+    assert per_field(rows) == bulk(rows)
+    slow = min(timeit.repeat(lambda: per_field(rows), number=1, repeat=repeat))
+    fast = min(timeit.repeat(lambda: bulk(rows), number=1, repeat=repeat))
+    print(f'{n} events: per-field {slow * 1000:.1f} ms, from_rows {fast * 1000:.1f} ms, speedup x{slow / fast:.1f}')
+    return {'per_field': slow, 'from_rows': fast}
+
+
+if __name__ == '__main__':
+    main()
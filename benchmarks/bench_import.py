@@ -0,0 +1,36 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, Optional
+
+ROOT = Path(__file__).parent.parent
+
+
+def import_times(module: str = 'event.cli', typecheck: Optional[bool] = None) -> Dict[str, int]:
+    env = dict(os.environ)
+    if typecheck is not None:
+        env['TODOLIST_TYPECHECK'] = '1' if typecheck else '0'
+    res = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'], cwd=ROOT, env=env,
+                         capture_output=True, text=True, check=True)
+    times = {}
+    for line in res.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def main(module: str = 'event.cli', repeat: int = 5) -> dict:
+    res = {}
+    for typecheck in (True, False):
+        res['typechecked' if typecheck else 'startup'] = min(import_times(module, typecheck)[module]
+                                                             for _ in range(repeat)) / 1e6
+    print(f'import {module}: typechecked {res["typechecked"] * 1000:.1f} ms, '
+          f'startup mode {res["startup"] * 1000:.1f} ms')
+    return res
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,28 @@
+import gc
+import tracemalloc
+
+from benchmarks.bench_domain import make_rows
+from event.domain import ToDoList
+
+
+def measure(compact: bool, rows: list) -> int:
+    gc.collect()
+    tracemalloc.start()
+    toDoList = ToDoList(compact)
+    toDoList.upsert_rows(rows)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current
+
+
+def main(n: int = 10000) -> dict:
+    rows = make_rows(n)
+    full = measure(False, rows)
+    compact = measure(True, rows)
+    print(f'{n} events: full {full / 2 ** 20:.1f} MiB, compact {compact / 2 ** 20:.1f} MiB, '
+          f'saving {100 * (1 - compact / full):.0f}%')
+    return {'full': full, 'compact': compact}
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,38 @@
+import contextlib
+import io
+import timeit
+
+from event.menu import Menu, Entry, MenuDescription, Key
+
+
+def make_menu(entries: int) -> Menu:
+    builder = Menu.Builder(MenuDescription('To Do List Home'))
+    for key in range(1, entries):
+        builder.with_entry(Entry.create(str(key), f'Entry number {key}'))
+    return builder.with_entry(Entry.create('0', 'Exit', is_exit=True)).build()
+
+
+def per_line(menu: Menu, entries: list) -> None:
+    length = len(str(menu.description))
+    fmt = '***{}{}{}***'
+    print(fmt.format('*', '*' * length, '*'))
+    print(fmt.format(' ', menu.description.value, ' '))
+    print(fmt.format('*', '*' * length, '*'))
+    menu.auto_select()
+    for entry in entries:
+        print(f'{entry.key}:\t{entry.description}')
+
+
+def main(entries: int = 10, redraws: int = 10000, repeat: int = 3) -> dict:
+    menu = make_menu(entries)
+    items = [menu.entry(Key(str(key))) for key in [*range(1, entries), 0]]
+    with contextlib.redirect_stdout(io.StringIO()):
+        slow = min(timeit.repeat(lambda: per_line(menu, items), number=redraws, repeat=repeat))
+        fast = min(timeit.repeat(menu.show, number=redraws, repeat=repeat))
+    print(f'{redraws} redraws of {entries} entries: per-line {slow * 1000:.1f} ms, cached {fast * 1000:.1f} ms, '
+          f'speedup x{slow / fast:.1f}')
+    return {'per_line': slow, 'cached': fast}
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,24 @@
+import timeit
+from datetime import datetime
+
+from event.domain import Name, Description, Author, Date, Location, Category, Priority, Event
+from validation.levels import LEVELS, validation_level
+
+
+def construct(n: int) -> list:
+    return [Event(i, Name(f'Evento {i}'), Description('partita di calcetto'), Author(1),
+                  Date(datetime(2099, 12, 25, 12)), Date(datetime(2099, 12, 26, 12)), Location('stadio'),
+                  Category(i % 4), Priority(i % 3)) for i in range(n)]
+
+
+def main(n: int = 1000, repeat: int = 3) -> dict:
+    res = {}
+    for level in LEVELS:
+        with validation_level(level):
+            res[level] = min(timeit.repeat(lambda: construct(n), number=1, repeat=repeat))
+    print(f'{n} events: ' + ', '.join(f'{level} {elapsed * 1000:.1f} ms' for level, elapsed in res.items()))
+    return res
+
+
+if __name__ == '__main__':
+    main()
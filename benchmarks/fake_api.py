@@ -0,0 +1,136 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional
+from urllib.parse import urlparse, parse_qs
+
+PREFIX = '/api/v1'
+
+
+def make_events(n: int, start_id: int = 1) -> List[dict]:
+    return [{'id': id, 'name': f'Evento {id}', 'description': 'partita di calcetto', 'author': 1,
+             'start_date': '2099-12-25T12:12:12Z', 'end_date': '2099-12-26T12:12:12Z',
+             'location': 'stadio', 'category': id % 4, 'priority': id % 3} for id in range(start_id, start_id + n)]
+
+
+class FakeApi:
+    def __init__(self, events: Optional[List[dict]] = None, delay: float = 0.0, key: str = 'fake-key',
+                 max_limit: Optional[int] = None, read_delay: float = 0.0):
+        self.events = list(events or [])
+        self.delay = delay
+        self.read_delay = read_delay
+        self.max_limit = max_limit
+        self.key = key
+        self.requests: List[str] = []
+        self.active = 0
+        self.max_active = 0
+        self.__lock = threading.Lock()
+        self.__server = ThreadingHTTPServer(('127.0.0.1', 0), self.__handler())
+        self.__thread = threading.Thread(target=self.__server.serve_forever, args=(0.05,), daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self.__server.server_address
+        return f'http://{host}:{port}{PREFIX}'
+
+    def __enter__(self) -> 'FakeApi':
+        self.__thread.start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.__server.shutdown()
+        self.__server.server_close()
+
+    def _track(self, delta: int) -> None:
+        with self.__lock:
+            self.active += delta
+            self.max_active = max(self.max_active, self.active)
+
+    def __handler(self):
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def __reply(self, status: int, body=None, headers: Optional[dict] = None) -> None:
+                payload = json.dumps(body).encode('utf-8') if body is not None else b''
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def __body(self) -> dict:
+                length = int(self.headers.get('Content-Length', 0))
+                raw = self.rfile.read(length).decode('utf-8') if length else ''
+                if self.headers.get('Content-Type', '').startswith('application/json'):
+                    return json.loads(raw)
+                return {key: values[0] for key, values in parse_qs(raw).items()}
+
+            def __authorized(self) -> bool:
+                return self.headers.get('Authorization') == f'Token {api.key}'
+
+            def __dispatch(self, method: str) -> None:
+                url = urlparse(self.path)
+                path = url.path[len(PREFIX):]
+                query = {key: values[0] for key, values in parse_qs(url.query).items()}
+                api.requests.append(f'{method} {path}')
+                api._track(1)
+                try:
+                    time.sleep(api.delay)
+                    self.__route(method, path, query)
+                finally:
+                    api._track(-1)
+
+            def __route(self, method: str, path: str, query: dict) -> None:
+                if method == 'POST' and path == '/auth/login/':
+                    return self.__reply(200, {'key': api.key})
+                if method == 'POST' and path == '/auth/registration/':
+                    return self.__reply(201, {})
+                if not self.__authorized():
+                    return self.__reply(401, {'detail': 'Invalid token.'})
+                if method == 'POST' and path == '/auth/logout/':
+                    return self.__reply(200, {})
+                if method == 'GET' and path.startswith('/author/'):
+                    return self.__reply(200, {'id': 1})
+                if method == 'GET' and path == '/events':
+                    etag = f'"{len(api.events)}"'
+                    if self.headers.get('If-None-Match') == etag:
+                        return self.__reply(304)
+                    if 'limit' not in query:
+                        snapshot = list(api.events)
+                        time.sleep(api.read_delay)
+                        return self.__reply(200, snapshot, {'ETag': etag})
+                    limit, offset = int(query['limit']), int(query.get('offset', 0))
+                    limit = min(limit, api.max_limit) if api.max_limit else limit
+                    return self.__reply(200, {'count': len(api.events), 'results': api.events[offset:offset + limit]},
+                                        {'ETag': etag})
+                if method == 'POST' and path == '/':
+                    item = dict(self.__body(), id=max([e['id'] for e in api.events], default=0) + 1)
+                    for key in ('author', 'category', 'priority'):
+                        item[key] = int(item[key])
+                    api.events.append(item)
+                    return self.__reply(201, item)
+                if method == 'DELETE':
+                    id = int(path.strip('/'))
+                    remaining = [e for e in api.events if e['id'] != id]
+                    if len(remaining) == len(api.events):
+                        return self.__reply(404, {'detail': 'Not found.'})
+                    api.events[:] = remaining
+                    return self.__reply(204)
+                return self.__reply(404, {'detail': 'Not found.'})
+
+            def do_GET(self):
+                self.__dispatch('GET')
+
+            def do_POST(self):
+                self.__dispatch('POST')
+
+            def do_DELETE(self):
+                self.__dispatch('DELETE')
+
+        return Handler
@@ -0,0 +1,281 @@
+import argparse
+import contextlib
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, asdict
+from datetime import datetime, timezone
+from io import StringIO
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from benchmarks import bench_dates, bench_import, bench_memory, bench_menu, bench_validation
+from benchmarks.bench_domain import make_rows, per_field
+from event.api import ApiClient, ApiConfig
+from event.app import App
+from event.cache import EventCache
+from event.domain import Event, ToDoList
+from benchmarks.fake_api import FakeApi, make_events
+from event.menu import Menu, Entry, MenuDescription, Key
+from event.output import Output
+from event.view import ListView
+from validation.levels import LEVELS, validation_level
+
+RESULTS = Path(__file__).parent / 'results'
+SIZES = (1000, 10000)
+REMOVALS = 1000
+REDRAWS = 1000
+
+
+@dataclass(frozen=True)
+class Result:
+    name: str
+    size: int
+    rounds: int
+    min: float
+    mean: float
+    max: float
+    stddev: float
+    unit: str = 'seconds'
+
+
+class Benchmark:
+    def __init__(self, rounds: int = 5, warmup: int = 1):
+        self.rounds = rounds
+        self.warmup = warmup
+        self.results: List[Result] = []
+
+    def __call__(self, name: str, size: int, target: Callable[[Any], Any],
+                 setup: Callable[[], Any] = lambda: None) -> Result:
+        timings = []
+        for round in range(self.warmup + self.rounds):
+            state = setup()
+            start = time.perf_counter()
+            target(state)
+            elapsed = time.perf_counter() - start
+            if round >= self.warmup:
+                timings.append(elapsed)
+        return self.record(name, size, timings)
+
+    def record(self, name: str, size: int, values: Sequence[float], unit: str = 'seconds') -> Result:
+        res = Result(name, size, len(values), min(values), statistics.mean(values), max(values),
+                     statistics.stdev(values) if len(values) > 1 else 0.0, unit)
+        self.results.append(res)
+        return res
+
+    def recorded(self, name: str) -> bool:
+        return any(res.name == name for res in self.results)
+
+
+CASES: Dict[str, Callable[[Benchmark, int], None]] = {}
+
+
+def case(name: str) -> Callable:
+    def register(function: Callable[[Benchmark, int], None]) -> Callable[[Benchmark, int], None]:
+        CASES[name] = function
+        return function
+    return register
+
+
+def _filled(events: List[Event]) -> ToDoList:
+    toDoList = ToDoList()
+    for event in events:
+        toDoList.add_event(event)
+    return toDoList
+
+
+@case('event_construction')
+def event_construction(benchmark: Benchmark, size: int) -> None:
+    rows = make_rows(size)
+    benchmark('event_construction', size, lambda _: per_field(rows))
+
+
+@case('event_from_rows')
+def event_from_rows(benchmark: Benchmark, size: int) -> None:
+    rows = make_rows(size)
+    benchmark('event_from_rows', size, lambda _: Event.from_rows(rows))
+
+
+@case('todolist_add')
+def todolist_add(benchmark: Benchmark, size: int) -> None:
+    events = Event.from_rows(make_rows(size))
+    benchmark('todolist_add', size, lambda toDoList: [toDoList.add_event(event) for event in events], ToDoList)
+
+
+@case('todolist_remove')
+def todolist_remove(benchmark: Benchmark, size: int) -> None:
+    events = Event.from_rows(make_rows(size))
+    removals = min(size, REMOVALS)
+
+    def target(toDoList: ToDoList) -> None:
+        for _ in range(removals):
+            toDoList.remove_event(toDoList.events() // 2)
+    benchmark('todolist_remove', size, target, lambda: _filled(events))
+
+
+@case('todolist_sort')
+def todolist_sort(benchmark: Benchmark, size: int) -> None:
+    toDoList = _filled(Event.from_rows(make_rows(size)))
+
+    def target(_) -> None:
+        for order in (toDoList.sort_by_start_date, toDoList.sort_by_priority):
+            order()
+            [toDoList.event(index) for index in range(min(size, 100))]
+    benchmark('todolist_sort', size, target)
+
+
+@case('fetch_events')
+def fetch_events(benchmark: Benchmark, size: int) -> None:
+    with FakeApi(make_events(size)) as api, tempfile.TemporaryDirectory() as directory:
+        def setup() -> App:
+            client = ApiClient(ApiConfig(api.url))
+            client.authenticate(api.key)
+            return App(client, cache=EventCache(Path(directory) / 'cache.csv'), output=Output(StringIO()))
+        benchmark('fetch_events', size, lambda app: app.fetch_events(), setup)
+
+
+@case('print_events')
+def print_events(benchmark: Benchmark, size: int) -> None:
+    toDoList = _filled(Event.from_rows(make_rows(size)))
+
+    def target(_) -> None:
+        output = Output(StringIO())
+        view = ListView()
+        for _ in range(view.pages(toDoList)):
+            output.print(view.render(toDoList))
+            output.flush()
+            view.next(toDoList)
+    benchmark('print_events', size, target)
+
+
+@case('menu_redraw')
+def menu_redraw(benchmark: Benchmark, size: int) -> None:
+    toDoList = _filled(Event.from_rows(make_rows(size)))
+    view, output = ListView(), Output(StringIO())
+    builder = Menu.Builder(MenuDescription('To Do List Home'), auto_select=lambda: output.print(view.render(toDoList)),
+                           output=output)
+    for key, description in (('1', 'Add event'), ('2', 'Remove event'), ('3', 'Sort by start date')):
+        builder.with_entry(Entry.create(key, description))
+    menu = builder.with_entry(Entry.create('0', 'Exit', is_exit=True)).build()
+
+    def target(_) -> None:
+        for _ in range(REDRAWS):
+            menu.show()
+    benchmark('menu_redraw', size, target)
+
+
+@case('date_parsing')
+def date_parsing(benchmark: Benchmark, size: int) -> None:
+    values = bench_dates.make_values(size, 100)
+    for name, parse in (('strptime', bench_dates.strptime), ('uncached', bench_dates.uncached),
+                        ('cached', bench_dates.codec)):
+        benchmark(f'date_parsing_{name}', size, lambda _: parse(values))
+
+
+@case('validation_levels')
+def validation_levels(benchmark: Benchmark, size: int) -> None:
+    for level in LEVELS:
+        def target(_) -> None:
+            with validation_level(level):
+                bench_validation.construct(size)
+        benchmark(f'validation_levels_{level}', size, target)
+
+
+@case('todolist_memory')
+def todolist_memory(benchmark: Benchmark, size: int) -> None:
+    rows = make_rows(size)
+    for compact in (False, True):
+        benchmark.record('todolist_memory_compact' if compact else 'todolist_memory_full', size,
+                         [bench_memory.measure(compact, rows)], 'bytes')
+
+
+@case('menu_redraw_per_line')
+def menu_redraw_per_line(benchmark: Benchmark, size: int) -> None:
+    menu = bench_menu.make_menu(10)
+    items = [menu.entry(Key(str(key))) for key in [*range(1, 10), 0]]
+
+    def target(_) -> None:
+        with contextlib.redirect_stdout(StringIO()):
+            for _ in range(REDRAWS):
+                bench_menu.per_line(menu, items)
+    benchmark('menu_redraw_per_line', size, target)
+
+
+@case('startup_import')
+def startup_import(benchmark: Benchmark, size: int) -> None:
+    for typecheck in (True, False):
+        name = 'startup_import_typechecked' if typecheck else 'startup_import'
+        if not benchmark.recorded(name):
+            benchmark.record(name, 0, [bench_import.import_times('event.cli', typecheck)['event.cli'] / 1e6
+                                       for _ in range(benchmark.rounds)])
+
+
+def _commit() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=Path(__file__).parent, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'local'
+
+
+def run(sizes: Sequence[int] = SIZES, rounds: int = 5, names: Optional[Sequence[str]] = None) -> dict:
+    benchmark = Benchmark(rounds)
+    for name, function in CASES.items():
+        if names and name not in names:
+            continue
+        for size in sizes:
+            function(benchmark, size)
+    return {'commit': _commit(), 'created': datetime.now(timezone.utc).isoformat(),
+            'python': platform.python_version(), 'results': [asdict(res) for res in benchmark.results]}
+
+
+def save(report: dict, path: Optional[Path] = None) -> Path:
+    path = path if path is not None else RESULTS / f'{report["commit"]}.json'
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, indent=2), encoding='utf-8')
+    return path
+
+
+def compare(baseline: dict, report: dict, threshold: float = 1.2) -> List[dict]:
+    previous = {(res['name'], res['size']): res['min'] for res in baseline['results']}
+    regressions = []
+    for res in report['results']:
+        before = previous.get((res['name'], res['size']))
+        if before and res['min'] / before > threshold:
+            regressions.append({'name': res['name'], 'size': res['size'], 'before': before, 'after': res['min'],
+                                'ratio': res['min'] / before})
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog='benchmarks.suite')
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(SIZES))
+    parser.add_argument('--rounds', type=int, default=5)
+    parser.add_argument('--only', nargs='+', choices=sorted(CASES))
+    parser.add_argument('--output', type=Path)
+    parser.add_argument('--compare', type=Path)
+    parser.add_argument('--threshold', type=float, default=1.2)
+    args = parser.parse_args(argv)
+
+    report = run(args.sizes, args.rounds, args.only)
+    for res in report['results']:
+        if res['unit'] == 'bytes':
+            print(f'{res["name"]:>28} {res["size"]:>8} {res["min"] / 2 ** 20:10.2f} MiB')
+            continue
+        print(f'{res["name"]:>28} {res["size"]:>8} min {res["min"] * 1000:10.2f} ms  '
+              f'mean {res["mean"] * 1000:10.2f} ms  stddev {res["stddev"] * 1000:8.2f} ms')
+    print(f'Saved to {save(report, args.output)}')
+    if args.compare is None:
+        return 0
+    regressions = compare(json.loads(args.compare.read_text(encoding='utf-8')), report, args.threshold)
+    for regression in regressions:
+        print(f'REGRESSION {regression["name"]} size {regression["size"]}: x{regression["ratio"]:.2f}')
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,317 @@
+import asyncio
+import inspect
+from typing import Any, Awaitable, Callable, List, Optional, Protocol, Set, Tuple
+
+from valid8 import validate
+
+from event.api import ApiClient, ApiConfig, api_server, event_payload
+from event.domain import Event, ToDoList
+from event.menu import Menu, Entry, MenuDescription, Key
+from event.output import Output
+from event.prompt import EVENT_PROMPTS, READ_ERRORS, parse_value, input_event
+from event.view import ListView
+
+
+class Transport(Protocol):
+    def authenticate(self, key: str) -> None: ...
+
+    def forget(self) -> None: ...
+
+    async def login(self, username: str, password: str) -> Tuple[int, Any]: ...
+
+    async def author(self, username: str) -> Tuple[int, Any]: ...
+
+    async def events(self) -> Tuple[int, List[dict]]: ...
+
+    async def create_event(self, obj: dict) -> Tuple[int, Any]: ...
+
+    async def delete_event(self, id: int) -> Tuple[int, Any]: ...
+
+    async def logout(self) -> Tuple[int, Any]: ...
+
+
+def _json(res: Any) -> Any:
+    try:
+        return res.json()
+    except ValueError:
+        return None
+
+
+class ThreadedTransport:
+    def __init__(self, api: Optional[ApiClient] = None):
+        self.__api = api if api is not None else ApiClient(ApiConfig(api_server))
+
+    @staticmethod
+    async def __call(method: Callable, *args) -> Tuple[int, Any]:
+        res = await asyncio.to_thread(method, *args)
+        return res.status_code, _json(res)
+
+    def authenticate(self, key: str) -> None:
+        self.__api.authenticate(key)
+
+    def forget(self) -> None:
+        self.__api.forget()
+
+    def close(self) -> None:
+        self.__api.close()
+
+    async def login(self, username: str, password: str) -> Tuple[int, Any]:
+        return await self.__call(self.__api.login, username, password)
+
+    async def author(self, username: str) -> Tuple[int, Any]:
+        return await self.__call(self.__api.author, username)
+
+    async def events(self) -> Tuple[int, List[dict]]:
+        def fetch():
+            res = self.__api.events()
+            return res.status_code, list(self.__api.event_items(res)) if res.status_code == 200 else []
+        return await asyncio.to_thread(fetch)
+
+    async def create_event(self, obj: dict) -> Tuple[int, Any]:
+        return await self.__call(self.__api.create_event, obj)
+
+    async def delete_event(self, id: int) -> Tuple[int, Any]:
+        return await self.__call(self.__api.delete_event, id)
+
+    async def logout(self) -> Tuple[int, Any]:
+        return await self.__call(self.__api.logout)
+
+
+async def ainput(prompt: str) -> str:
+    return await asyncio.to_thread(input, prompt)
+
+
+class AsyncMenu:
+    def __init__(self, menu: Menu, read: Callable[[str], Awaitable[str]] = ainput):
+        self.__menu = menu
+        self.__read = read
+
+    async def __select_from_input(self) -> Entry:
+        while True:
+            try:
+                self.__menu.output.flush()
+                line = await self.__read('? ')
+                return self.__menu.entry(Key(line.strip()))
+            except (KeyError, TypeError, ValueError) as e:
+                self.__menu.output.print(e)
+                self.__menu.output.print('Invalid selection. Please, try again...')
+
+    async def run(self) -> Tuple[bool, bool]:
+        while True:
+            self.__menu.show()
+            entry = await self.__select_from_input()
+            res = entry.on_selected()
+            if inspect.isawaitable(res):
+                await res
+            is_exit, is_logged = entry.is_exit, entry.is_logged()
+            if is_exit or is_logged:
+                return is_exit, is_logged
+
+
+class AsyncApp:
+    def __init__(self, transport: Optional[Transport] = None, refresh_interval: float = 30.0, compact: bool = False,
+                 read: Callable[[str], Awaitable[str]] = ainput, output: Optional[Output] = None,
+                 page_size: int = 20):
+        self.__output = output if output is not None else Output()
+        self.__transport = transport if transport is not None else ThreadedTransport()
+        self.__refresh_interval = refresh_interval
+        self.__compact = compact
+        self.__read = read
+        self.__toDoList = ToDoList(compact)
+        self.__view = ListView(page_size)
+        self.__order: Optional[str] = None
+        self.__tasks: Set[asyncio.Task] = set()
+        self.__refresher: Optional[asyncio.Task] = None
+        self.__key = None
+        self.__author_id = None
+
+    @property
+    def is_logged(self) -> bool:
+        return self.__key is not None
+
+    @property
+    def toDoList(self) -> ToDoList:
+        return self.__toDoList
+
+    def spawn(self, coroutine: Awaitable) -> asyncio.Task:
+        task = asyncio.ensure_future(coroutine)
+        self.__tasks.add(task)
+        task.add_done_callback(self.__tasks.discard)
+        return task
+
+    async def drain(self) -> None:
+        while self.__tasks:
+            await asyncio.gather(*list(self.__tasks), return_exceptions=True)
+
+    async def login(self, username: str, password: str) -> bool:
+        status, body = await self.__transport.login(username, password)
+        if status != 200:
+            return False
+        key = body['key']
+        self.__transport.authenticate(key)
+        status, body = await self.__transport.author(username)
+        if status != 200:
+            self.__transport.forget()
+            return False
+        self.__key = key
+        self.__author_id = body['id']
+        return True
+
+    async def fetch_events(self) -> Optional[int]:
+        status, items = await self.__transport.events()
+        if status != 200 or not self.is_logged:
+            return None
+        fresh = ToDoList(self.__compact)
+        fresh.upsert_rows(items)
+        if self.__order is not None:
+            getattr(fresh, self.__order)()
+        self.__toDoList = fresh
+        return fresh.events()
+
+    async def add_event(self, event: Event) -> bool:
+        status, body = await self.__transport.create_event(event_payload(event))
+        if status not in (200, 201):
+            return False
+        if isinstance(body, dict) and 'id' in body:
+            self.__toDoList.upsert_event(Event.from_trusted_dict(body))
+        else:
+            await self.fetch_events()
+        return True
+
+    async def remove_event(self, id: int) -> bool:
+        status, _ = await self.__transport.delete_event(id)
+        if status not in (200, 204):
+            return False
+        if self.__toDoList.contains(id):
+            self.__toDoList.remove_by_id(id)
+        return True
+
+    async def logout(self) -> bool:
+        self.stop_refresh()
+        try:
+            status, _ = await self.__transport.logout()
+        finally:
+            self.__transport.forget()
+            self.__key = None
+            self.__author_id = None
+            self.__toDoList = ToDoList(self.__compact)
+            self.__view.clear()
+        return status == 200
+
+    async def __refresh_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.__refresh_interval)
+            try:
+                await self.fetch_events()
+            except (OSError, ValueError):
+                pass
+
+    def start_refresh(self) -> None:
+        if self.__refresher is None:
+            self.__refresher = asyncio.ensure_future(self.__refresh_loop())
+
+    def stop_refresh(self) -> None:
+        if self.__refresher is not None:
+            self.__refresher.cancel()
+            self.__refresher = None
+
+    def sort_by(self, order: str) -> None:
+        self.__order = order
+        getattr(self.__toDoList, order)()
+
+    def print_events(self) -> None:
+        self.__output.print(self.__view.render(self.__toDoList))
+
+    async def __read_line(self, prompt: str) -> str:
+        self.__output.flush()
+        return await self.__read(prompt)
+
+    async def __read_value(self, prompt: str, builder: Callable) -> Any:
+        while True:
+            try:
+                return parse_value(prompt, await self.__read_line(f'{prompt}: '), builder)
+            except READ_ERRORS as e:
+                self.__output.print(e)
+
+    async def __login_from_input(self) -> None:
+        username = await self.__read_line('Username: ')
+        password = await self.__read_line('Password: ')
+        await self.__report(self.__login_and_fetch(username, password), None, 'Wrong Credentials!')
+
+    async def __login_and_fetch(self, username: str, password: str) -> bool:
+        if not await self.login(username, password):
+            return False
+        self.start_refresh()
+        await self.fetch_events()
+        return True
+
+    async def __add_from_input(self) -> None:
+        values = [await self.__read_value(prompt, builder) for prompt, builder in EVENT_PROMPTS]
+        try:
+            event = input_event(self.__author_id, values)
+        except READ_ERRORS as e:
+            self.__output.print(e)
+            return
+        self.spawn(self.__report(self.add_event(event), 'Event added!', 'Unable to add the event'))
+
+    async def __remove_from_input(self) -> None:
+        def builder(value: str) -> int:
+            validate('value', int(value), min_value=0, max_value=self.__toDoList.events())
+            return int(value)
+
+        index = await self.__read_value('Index (0 to cancel)', builder)
+        if index == 0:
+            self.__output.print('Cancelled!')
+            return
+        id = self.__toDoList.event(index - 1).id
+        self.spawn(self.__report(self.remove_event(id), 'Event removed', 'Unable to remove the event'))
+
+    async def __logout_from_input(self) -> None:
+        await self.drain()
+        await self.__report(self.logout(), 'Logged out!', 'Log out failed')
+        self.__output.print()
+
+    async def __report(self, operation: Awaitable[bool], success: Optional[str], failure: str) -> None:
+        try:
+            ok = await operation
+        except (OSError, ValueError) as e:
+            self.__output.print(e)
+            ok = False
+        if not ok:
+            self.__output.print(failure)
+        elif success is not None:
+            self.__output.print(success)
+
+    def __first_menu(self) -> AsyncMenu:
+        return AsyncMenu(Menu.Builder(MenuDescription('To Do List Login'), auto_select=lambda: self.print_events(),
+                                      output=self.__output)
+                         .with_entry(Entry.create('1', 'Login', on_selected=lambda: self.__login_from_input(),
+                                                  is_logged=lambda: self.is_logged))
+                         .with_entry(Entry.create('0', 'Exit', on_selected=lambda: self.__output.print('Bye!'),
+                                                  is_exit=True))
+                         .build(), self.__read_line)
+
+    def __home_menu(self) -> AsyncMenu:
+        return AsyncMenu(Menu.Builder(MenuDescription('To Do List Home'), auto_select=lambda: self.print_events(),
+                                      output=self.__output)
+                         .with_entry(Entry.create('1', 'Add event', on_selected=lambda: self.__add_from_input()))
+                         .with_entry(Entry.create('2', 'Remove event', on_selected=lambda: self.__remove_from_input()))
+                         .with_entry(Entry.create('3', 'Sort by start date',
+                                                  on_selected=lambda: self.sort_by('sort_by_start_date')))
+                         .with_entry(Entry.create('4', 'Sort by priority',
+                                                  on_selected=lambda: self.sort_by('sort_by_priority')))
+                         .with_entry(Entry.create('5', 'Print Events', on_selected=lambda: self.print_events()))
+                         .with_entry(Entry.create('6', 'Next page',
+                                                  on_selected=lambda: self.__view.next(self.__toDoList)))
+                         .with_entry(Entry.create('7', 'Previous page',
+                                                  on_selected=lambda: self.__view.prev(self.__toDoList)))
+                         .with_entry(Entry.create('0', 'Exit', on_selected=lambda: self.__logout_from_input(),
+                                                  is_exit=True))
+                         .build(), self.__read_line)
+
+    async def run(self) -> None:
+        first_menu, home_menu = self.__first_menu(), self.__home_menu()
+        while not await first_menu.run() == (True, False):
+            await home_menu.run()
+        await self.drain()
+        self.__output.flush()
@@ -0,0 +1,251 @@
+import threading
+import time
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from itertools import chain
+from typing import Any, Iterator, List, Optional, Tuple
+
+from valid8 import validate
+
+from event.domain import Event
+from event.jsonstream import iter_array
+from event.metrics import Instruments, DISABLED, TraceLog, TimedIterator
+from validation.dataclasses import validate_dataclass
+from validation.typechecking import typechecked
+
+api_server = 'http://localhost:8000/api/v1'
+
+
+def _length(headers: Any) -> int:
+    try:
+        return int(headers.get('Content-Length', 0)) if isinstance(headers, Mapping) else 0
+    except ValueError:
+        return 0
+
+
+def event_payload(event: Event) -> dict:
+    return {
+        "name": str(event.name),
+        "description": str(event.description),
+        "author": event.author.key,
+        "start_date": event.start_date.to_server(),
+        "end_date": event.end_date.to_server(),
+        "location": str(event.location),
+        "priority": str(event.priority),
+        "category": str(event.category)
+    }
+
+
+@typechecked
+@dataclass(frozen=True)
+class ApiConfig:
+    base_url: str = api_server
+    pool_size: int = 10
+    connect_timeout: float = 3.05
+    read_timeout: float = 10.0
+    retries: int = 3
+    backoff_factor: float = 0.3
+    stream: bool = False
+    chunk_size: int = 64 * 1024
+    page_size: int = 0
+    workers: int = 4
+
+    def __post_init__(self):
+        validate_dataclass(self)
+        validate('base_url', self.base_url, min_len=1)
+        validate('pool_size', self.pool_size, min_value=1)
+        validate('connect_timeout', self.connect_timeout, min_value=0.0, min_strict=True)
+        validate('read_timeout', self.read_timeout, min_value=0.0, min_strict=True)
+        validate('retries', self.retries, min_value=0)
+        validate('backoff_factor', self.backoff_factor, min_value=0.0)
+        validate('chunk_size', self.chunk_size, min_value=1)
+        validate('page_size', self.page_size, min_value=0)
+        validate('workers', self.workers, min_value=1)
+
+    @property
+    def timeout(self) -> Tuple[float, float]:
+        return self.connect_timeout, self.read_timeout
+
+
+class ApiClient:
+    def __init__(self, config: ApiConfig = ApiConfig(), instruments: Instruments = DISABLED,
+                 trace: Optional[TraceLog] = None):
+        self.__config = config
+        self.__instruments = instruments
+        self.__trace = trace
+        self.__lock = threading.Lock()
+        self.__client = None
+
+    @property
+    def __session(self) -> Any:
+        if self.__client is None:
+            with self.__lock:
+                if self.__client is None:
+                    self.__client = self.__connect()
+        return self.__client
+
+    def __connect(self) -> Any:
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        config = self.__config
+        session = requests.Session()
+        retry = Retry(total=config.retries, backoff_factor=config.backoff_factor,
+                      status_forcelist=(502, 503, 504), allowed_methods=frozenset({'GET', 'DELETE'}),
+                      raise_on_status=False)
+        adapter = HTTPAdapter(pool_connections=config.pool_size, pool_maxsize=config.pool_size, max_retries=retry)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+
+    @property
+    def config(self) -> ApiConfig:
+        return self.__config
+
+    @property
+    def instruments(self) -> Instruments:
+        return self.__instruments
+
+    @property
+    def trace(self) -> Optional[TraceLog]:
+        return self.__trace
+
+    def __call(self, endpoint: str, method: str, **kwargs) -> Any:
+        if not self.__instruments.enabled and self.__trace is None:
+            return getattr(self.__session, method)(**kwargs)
+        res = None
+        start = time.perf_counter()
+        try:
+            res = getattr(self.__session, method)(**kwargs)
+            return res
+        finally:
+            self.__record(endpoint, method.upper(), kwargs['url'], res, time.perf_counter() - start)
+
+    def __record(self, endpoint: str, method: str, url: str, res: Any, seconds: float) -> None:
+        status = res.status_code if res is not None else 'error'
+        sent = _length(getattr(res.request, 'headers', None)) if res is not None else 0
+        received = _length(res.headers) if res is not None else 0
+        name = f'api.{endpoint}'
+        instruments = self.__instruments
+        instruments.observe(name, seconds)
+        instruments.count(f'{name}.calls')
+        instruments.count(f'{name}.status.{status}')
+        if res is None or status >= 400:
+            instruments.count(f'{name}.errors')
+        instruments.count(f'{name}.bytes_sent', sent)
+        instruments.count(f'{name}.bytes_received', received)
+        if self.__trace is not None:
+            self.__trace.record(method, url, status, seconds, sent, received)
+
+    @property
+    def is_authenticated(self) -> bool:
+        return self.__client is not None and 'Authorization' in self.__client.headers
+
+    def __url(self, path: str) -> str:
+        return f'{self.__config.base_url}/{path}'
+
+    def authenticate(self, key: str) -> None:
+        self.__session.headers['Authorization'] = f'Token {key}'
+
+    def forget(self) -> None:
+        if self.__client is not None:
+            self.__client.headers.pop('Authorization', None)
+
+    def close(self) -> None:
+        if self.__client is not None:
+            self.__client.close()
+
+    def login(self, username: str, password: str) -> Any:
+        return self.__call('login', 'post', url=self.__url('auth/login/'),
+                           data={'username': username, 'password': password}, timeout=self.__config.timeout)
+
+    def registration(self, username: str, email: str, password1: str, password2: str) -> Any:
+        return self.__call('registration', 'post', url=self.__url('auth/registration/'),
+                           data={'username': username, 'email': email, 'password1': password1,
+                                 'password2': password2},
+                           timeout=self.__config.timeout)
+
+    def author(self, username: str) -> Any:
+        return self.__call('author', 'get', url=self.__url(f'author/{username}'), timeout=self.__config.timeout)
+
+    def events(self, etag: Optional[str] = None, modified_since: Optional[str] = None, offset: int = 0) -> Any:
+        kwargs = {}
+        params = {}
+        if etag is not None:
+            kwargs['headers'] = {'If-None-Match': etag}
+        if modified_since is not None:
+            params['modified_since'] = modified_since
+        if self.__config.page_size:
+            params['limit'] = self.__config.page_size
+            params['offset'] = offset
+        elif self.__config.stream:
+            kwargs['stream'] = True
+        if params:
+            kwargs['params'] = params
+        return self.__call('events', 'get', url=self.__url('events'), timeout=self.__config.timeout, **kwargs)
+
+    def event_items(self, res: Any, modified_since: Optional[str] = None) -> Iterator[dict]:
+        if self.__config.stream and not self.__config.page_size:
+            return self.__streamed_items(res)
+        return chain.from_iterable(self.event_pages(res, modified_since))
+
+    def event_pages(self, res: Any, modified_since: Optional[str] = None) -> Iterator[List[dict]]:
+        body = self.__decode(res)
+        if isinstance(body, list):
+            return iter([body])
+        return self.__paged_items(body, modified_since)
+
+    def __decode(self, res: Any) -> Any:
+        with self.__instruments.timer('api.events.decode'):
+            return res.json()
+
+    def __streamed_items(self, res: Any) -> Iterator[dict]:
+        try:
+            if not self.__instruments.enabled:
+                yield from iter_array(res.iter_content(chunk_size=self.__config.chunk_size))
+                return
+            chunks = TimedIterator(res.iter_content(chunk_size=self.__config.chunk_size))
+            items = TimedIterator(iter_array(chunks))
+            try:
+                yield from items
+            finally:
+                self.__instruments.observe('api.events.read', chunks.elapsed)
+                self.__instruments.observe('api.events.decode', items.elapsed - chunks.elapsed)
+        finally:
+            res.close()
+
+    def __page(self, offset: int, modified_since: Optional[str]) -> List[dict]:
+        res = self.events(modified_since=modified_since, offset=offset)
+        res.raise_for_status()
+        return self.__decode(res)['results']
+
+    def __page_range(self, offset: int, end: int, modified_since: Optional[str]) -> List[dict]:
+        items = []
+        while offset < end:
+            page = self.__page(offset, modified_since)[:end - offset]
+            if not page:
+                break
+            items += page
+            offset += len(page)
+        return items
+
+    def __paged_items(self, first: dict, modified_since: Optional[str]) -> Iterator[List[dict]]:
+        yield first['results']
+        step, total = len(first['results']), first['count']
+        offsets = range(step, total, step) if step else range(0)
+        if not offsets:
+            return
+        with ThreadPoolExecutor(max_workers=self.__config.workers) as executor:
+            yield from executor.map(lambda offset: self.__page_range(offset, min(offset + step, total), modified_since),
+                                    offsets)
+
+    def create_event(self, obj: dict) -> Any:
+        return self.__call('create_event', 'post', url=self.__url(''), json=obj, timeout=self.__config.timeout)
+
+    def delete_event(self, id: int) -> Any:
+        return self.__call('delete_event', 'delete', url=self.__url(f'{id}/'), timeout=self.__config.timeout)
+
+    def logout(self) -> Any:
+        return self.__call('logout', 'post', url=self.__url('auth/logout/'), timeout=self.__config.timeout)
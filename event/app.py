@@ -1,16 +1,20 @@
 import sys
-from datetime import datetime
+import threading
 
-import requests
 from pathlib import Path
-from typing import Any, Tuple, Callable
+from typing import Any, Tuple, Callable, Optional, Iterable, Iterator
 
-from valid8 import validate, ValidationError
+from valid8 import validate
 
-from event.domain import Name, Description, Author, Date, Priority, Category, Location, Event, ToDoList
+from event.api import ApiClient, ApiConfig, api_server, event_payload
+from event.cache import EventCache
+from event.domain import Name, Description, Date, Priority, Category, Location, Event, ToDoList
+from event.metrics import Instruments, DISABLED, MemorySink, TraceLog, summary
 from event.menu import Menu, Entry, MenuDescription
-
-api_server = 'http://localhost:8000/api/v1'
+from event.output import Output
+from event.prompt import EVENT_PROMPTS, READ_ERRORS, parse_value, input_event
+from event.view import ListView
+from event.writequeue import WriteQueue, PendingWrite
 
 
 class App:
@@ -18,95 +22,159 @@ class App:
     __delimiter = '\t'
 
     __key = None
+    __authorID = None
     __is_logged = False
+    username = None
+    __etag = None
+    __modified_since = None
 
     def __first_menu(self):
-        self.__first_menu = Menu.Builder(MenuDescription('To Do List Login'), auto_select=lambda: self.__print_events()) \
+        self.__first_menu = Menu.Builder(MenuDescription('To Do List Login'), auto_select=lambda: self.__print_events(),
+                                         output=self.__output) \
             .with_entry(Entry.create('1', 'Login', is_logged=lambda: self.__login())) \
             .with_entry(Entry.create('2', 'Sign in', on_selected=lambda: self.__registrati())) \
-            .with_entry(Entry.create('0', 'Exit', on_selected=lambda: print('Bye!'), is_exit=True)) \
+            .with_entry(Entry.create('0', 'Exit', on_selected=lambda: self.__output.print('Bye!'), is_exit=True)) \
             .build()
 
     def __real_menu(self):
-        self.__menu = Menu.Builder(MenuDescription('To Do List Home'), auto_select=lambda: self.__print_events()) \
+        self.__menu = Menu.Builder(MenuDescription('To Do List Home'), auto_select=lambda: self.__print_events(),
+                                   output=self.__output) \
             .with_entry(Entry.create('1', 'Add event', on_selected=lambda: self.__add_event())) \
             .with_entry(Entry.create('2', 'Remove event', on_selected=lambda: self.__remove_event())) \
             .with_entry(Entry.create('3', 'Sort by start date', on_selected=lambda: self.__sort_by_start_date())) \
             .with_entry(Entry.create('4', 'Sort by priority', on_selected=lambda: self.__sort_by_priority())) \
             .with_entry(Entry.create('5', 'Print Events', on_selected=lambda: self.__print_events())) \
-            .with_entry(Entry.create('0', 'Exit', on_selected=lambda: self.logout(), is_exit=True)) \
+            .with_entry(Entry.create('6', 'Next page', on_selected=lambda: self.__view.next(self.__toDoList))) \
+            .with_entry(Entry.create('7', 'Previous page', on_selected=lambda: self.__view.prev(self.__toDoList))) \
+            .with_entry(Entry.create('8', 'Go to page', on_selected=lambda: self.__jump_to_page())) \
+            .with_entry(Entry.create('9', 'Statistics', on_selected=lambda: self.__print_stats())) \
+            .with_entry(Entry.create('10', 'Log out', on_selected=lambda: self.logout(), is_exit=True)) \
+            .with_entry(Entry.create('0', 'Exit', on_selected=lambda: self.logout(invalidate_cache=False),
+                                     is_exit=True)) \
             .build()
 
-    def __init__(self):
+    def __init__(self, api: Optional[ApiClient] = None, compact: bool = False, cache: Optional[EventCache] = None,
+                 batch_size: int = 0, flush_interval: Optional[float] = 1.0, page_size: int = 20,
+                 output: Optional[Output] = None, instruments: Optional[Instruments] = None):
+        self.__output = output if output is not None else Output()
         self.__first_menu()
         self.__real_menu()
-        self.__toDoList = ToDoList()
+        self.__api = api if api is not None else ApiClient(ApiConfig(api_server), instruments or DISABLED)
+        self.__instruments = instruments if instruments is not None else self.__api.instruments
+        self.__toDoList = ToDoList(compact, self.__instruments)
+        self.__view = ListView(page_size)
+        self.__lock = threading.RLock()
+        self.__loading: Optional[threading.Thread] = None
+        self.__cache = cache if cache is not None else EventCache(self.__filename, self.__delimiter)
+        self.__writes = WriteQueue(self.__api, lambda: self.__toDoList, batch_size, flush_interval,
+                                   on_failure=self.__write_failed, on_resync=self.__resync,
+                                   lock=self.__lock) if batch_size else None
+
+    @property
+    def toDoList(self) -> ToDoList:
+        return self.__toDoList
+
+    @property
+    def author_id(self) -> Optional[int]:
+        return self.__authorID
+
+    @property
+    def api(self) -> ApiClient:
+        return self.__api
+
+    @property
+    def instruments(self) -> Instruments:
+        return self.__instruments
 
     def __login(self):
-        self.username = input('Username: ')
-        password = input('Password: ')
+        username = self.__output.read('Username: ')
+        password = self.__output.read('Password: ')
+        if not self.login(username, password):
+            self.__output.print('Wrong Credentials!')
+            return False
+        self.__output.print(self.__key)
+        return True
 
-        res = requests.post(url=f'{api_server}/auth/login/', data={'username': self.username, 'password': password})
+    def login(self, username: str, password: str) -> bool:
+        self.username = username
+        res = self.__api.login(self.username, password)
         if res.status_code != 200:
-            print('Wrong Credentials!')
             return False
         json = res.json()
         self.__key = json['key']
-        print(self.__key)
-        res2 = requests.get(url=f'{api_server}/author/{self.username}',
-                            headers={'Authorization': f'Token {self.__key}'})
+        self.__api.authenticate(self.__key)
+        res2 = self.__api.author(self.username)
+        if res2.status_code != 200:
+            self.__api.forget()
+            self.__key = None
+            return False
         #resString = str(res2.content)
         json=res2.json()
         self.__authorID = json['id']#int(resString[8:-2])
         return True
 
     def __registrati(self):
-        username = input('Username: ')
-        email = input("Email: ")
-        password = input('Password: ')
-        password2 = input('Ripeti Password: ')
+        username = self.__output.read('Username: ')
+        email = self.__output.read("Email: ")
+        password = self.__output.read('Password: ')
+        password2 = self.__output.read('Ripeti Password: ')
 
-        res = requests.post(url=f'{api_server}/auth/registration/',
-                            data={'username': username, 'email': email, 'password1': password, 'password2': password2})
+        res = self.__api.registration(username, email, password, password2)
         # print(res.json())
         if res.status_code == 400:
-            print('Something went wrong')
+            self.__output.print('Something went wrong')
 
 
     def __print_events(self) -> None:
-        print_sep = lambda: print('-' * 150)
-        print_sep()
-        fmt = '%20s %30s %5s %20s %20s %20s %10s %10s'
-        print(fmt % ('NAME', 'DESCRIPTION', 'AUTHOR', 'START DATE', 'END DATE', 'LOCATION', 'CATEGORY', 'PRIORITY'))
-        print_sep()
-        for index in range(self.__toDoList.events()):
-            event = self.__toDoList.event(index)
-            print(fmt % (
-                event.name.value, event.description.value, event.author.key, event.start_date.date, event.end_date.date,
-                event.location.value, event.category.value, event.priority.value))
-        print_sep()
+        with self.__instruments.timer('render.print_events'), self.__lock:
+            self.__output.print(self.__view.render(self.__toDoList))
+
+    def __print_stats(self) -> None:
+        sinks = [sink for sink in self.__instruments.sinks if isinstance(sink, MemorySink)]
+        trace = self.__api.trace
+        if not sinks and trace is None:
+            self.__output.print('Statistics are disabled')
+            return
+        for sink in sinks:
+            self.__output.print(summary(sink))
+        for entry in trace.recent() if trace is not None else ():
+            self.__output.print(entry)
+
+    def __jump_to_page(self) -> None:
+        def builder(value: str) -> int:
+            validate('value', int(value), min_value=1, max_value=self.__view.pages(self.__toDoList))
+            return int(value)
+
+        self.__view.jump(self.__toDoList, self.__read('Page', builder) - 1)
 
     def __add_event(self) -> None:
-        name, description, start_date, end_date, location, category, priority = self.__read_event()
-        print(self.__authorID)
-        event = Event(-1, name, description, Author(self.__authorID), start_date, end_date, location, category,
-                      priority)
-        self.__toDoList.add_event(event)
-        obj = {
-            "name": str(name),
-            "description": str(description),
-            "author": self.__authorID,
-            "start_date": str(start_date),
-            "end_date": str(end_date.date),
-            "location": str(location),
-            "priority": str(category),
-            "category": str(priority)
-        }
-
-        res = requests.post(url=f'{api_server}/', json=obj, headers={'Authorization': f'Token {self.__key}'});
-        self.__toDoList.clear()
-        self.fetch_events()
-        print('Event added!')
+        values = self.__read_event()
+        self.__output.print(self.__authorID)
+        try:
+            event = input_event(self.__authorID, values)
+        except READ_ERRORS as e:
+            self.__output.print(e)
+            return
+        if self.add_event(event) is None:
+            self.__output.print('Unable to add event')
+            return
+        self.__output.print('Event added!')
+
+    def add_event(self, event: Event) -> Optional[Event]:
+        if self.__writes is not None:
+            return self.__writes.create(event)
+
+        res = self.__api.create_event(event_payload(event))
+        if res.status_code not in (200, 201):
+            return None
+        created = res.json()
+        if isinstance(created, dict) and 'id' in created:
+            created = Event.from_trusted_dict(created)
+            with self.__lock:
+                self.__toDoList.upsert_event(created)
+            return created
+        self.__resync()
+        return event
 
     def __remove_event(self) -> None:
         def builder(value: str) -> int:
@@ -115,51 +183,169 @@ class App:
 
         index = self.__read('Index (0 to cancel)', builder)
         if index == 0:
-            print('Cancelled!')
+            self.__output.print('Cancelled!')
             return
-        todelete = self.__toDoList.event(index - 1)
-        res = requests.delete(url=f'{api_server}/{todelete.id}/', headers={'Authorization': f'Token {self.__key}'})
-        self.__toDoList.remove_event(index - 1)
-        print('Event removed')
+        with self.__lock:
+            id = self.__toDoList.event(index - 1).id if index <= self.__toDoList.events() else None
+        if id is None or not self.remove_event(id):
+            self.__output.print('Unable to remove event')
+            return
+        self.__output.print('Event removed')
+
+    def remove_event(self, id: int) -> bool:
+        with self.__lock:
+            if not self.__toDoList.contains(id):
+                return False
+            todelete = self.__toDoList.get_by_id(id)
+        if self.__writes is not None:
+            self.__writes.delete(todelete)
+            return True
+        res = self.__api.delete_event(todelete.id)
+        if res.status_code not in (200, 204):
+            return False
+        with self.__lock:
+            if self.__toDoList.contains(todelete.id):
+                self.__toDoList.remove_by_id(todelete.id)
+        return True
+
+    def __write_failed(self, write: PendingWrite) -> None:
+        self.__output.print(f'Unable to {write.kind} event {write.event.name}, change rolled back')
+
+    def flush(self) -> None:
+        if self.__writes is not None:
+            self.__writes.flush()
 
     def __sort_by_start_date(self) -> None:
-        self.__toDoList.sort_by_start_date()
+        with self.__lock:
+            self.__toDoList.sort_by_start_date()
 
     def __sort_by_priority(self) -> None:
-        self.__toDoList.sort_by_priority()
+        with self.__lock:
+            self.__toDoList.sort_by_priority()
+
+    def __resync(self) -> None:
+        with self.__lock:
+            self.__etag = None
+            self.__modified_since = None
+            self.__toDoList.clear()
+        self.fetch_events()
+
+    def __save_cache(self) -> None:
+        if self.username is None:
+            return
+        with self.__lock:
+            rows = [event.to_row() for event in self.__toDoList.in_insertion_order()]
+        self.__cache.save(self.username, rows)
 
-    def fetch_events(self):
-        res = requests.get(url=f'{api_server}/events', headers={'Authorization': f'Token {self.__key}'})
+    def __warm_start(self) -> bool:
+        rows = self.__cache.load(self.username)
+        if not rows:
+            return False
+        with self.__lock:
+            self.__toDoList.upsert_rows(rows)
+        self.__loading = threading.Thread(target=self.__reconcile, args=(self.__key,), daemon=True)
+        self.__loading.start()
+        return True
+
+    def __reconcile(self, key: str) -> None:
+        with self.__lock:
+            before = self.__toDoList.ids()
+        with self.__instruments.timer('fetch.request'):
+            res = self.__api.events()
         if res.status_code != 200:
+            return
+        try:
+            rows = list(self.__api.event_items(res))
+        finally:
+            res.close()
+        with self.__instruments.timer('fetch.merge'), self.__lock:
+            if self.__key != key:
+                return
+            current = self.__toDoList.ids()
+            self.__toDoList.upsert_rows(row for row in rows if row['id'] in current or row['id'] not in before)
+            self.__toDoList.remove_many((before & current) - {row['id'] for row in rows})
+            self.__etag = res.headers.get('ETag')
+            self.__modified_since = res.headers.get('Last-Modified', res.headers.get('Date'))
+        self.__save_cache()
+
+    def fetch_events(self, wait: bool = True):
+        with self.__instruments.timer('fetch.total'):
+            return self.__fetch_events(wait)
+
+    def wait(self) -> None:
+        loading = self.__loading
+        if loading is not None:
+            loading.join()
+
+    def __fetch_events(self, wait: bool):
+        self.wait()
+        with self.__instruments.timer('fetch.request'):
+            res = self.__api.events(etag=self.__etag, modified_since=self.__modified_since)
+        if res.status_code == 304:
+            self.__instruments.count('fetch.not_modified')
+            return 0
+        if res.status_code != 200:
+            self.__instruments.count('fetch.failed')
             return None
 
-        json = res.json()
-        for item in json:
-            id = int(item['id'])
-            name = Name(item['name'])
-            description = Description(item['description'])
-            author = Author(item['author'])
-            start_date = Date(datetime.strptime(item['start_date'], '%Y-%m-%dT%H:%M:%SZ'))
-            end_date = Date(datetime.strptime(item['end_date'], '%Y-%m-%dT%H:%M:%SZ'))
-            location = Location(item['location'])
-            category = Category(item['category'])
-            priority = Priority(item['priority'])
-            self.__toDoList.add_event(
-                Event(id, name, description, author, start_date, end_date, location, category, priority))
-
-        return res.json()
+        key = self.__key
+        try:
+            if self.__api.config.page_size:
+                pages = self.__api.event_pages(res, self.__modified_since)
+            else:
+                pages = iter([self.__api.event_items(res, self.__modified_since)])
+            merged = self.__merge(next(pages, []), key)
+        except BaseException:
+            res.close()
+            raise
+        if wait or not self.__api.config.page_size:
+            return self.__merge_rest(res, pages, key, merged)
+        self.__loading = threading.Thread(target=self.__merge_in_background, args=(res, pages, key, merged),
+                                          daemon=True)
+        self.__loading.start()
+        return merged
+
+    def __merge(self, rows: Iterable[dict], key: Optional[str]) -> int:
+        with self.__instruments.timer('fetch.merge'), self.__lock:
+            return self.__toDoList.upsert_rows(rows) if self.__key == key else 0
+
+    def __merge_rest(self, res: Any, pages: Iterator[Iterable[dict]], key: Optional[str], merged: int) -> int:
+        try:
+            for page in pages:
+                if self.__key != key:
+                    return merged
+                merged += self.__merge(page, key)
+        finally:
+            res.close()
+        with self.__lock:
+            if self.__key != key:
+                return merged
+            self.__etag = res.headers.get('ETag')
+            self.__modified_since = res.headers.get('Last-Modified', res.headers.get('Date'))
+        if merged:
+            with self.__instruments.timer('fetch.save_cache'):
+                self.__save_cache()
+        return merged
+
+    def __merge_in_background(self, res: Any, pages: Iterator[Iterable[dict]], key: Optional[str],
+                              merged: int) -> None:
+        try:
+            self.__merge_rest(res, pages, key, merged)
+        except (OSError, ValueError):
+            self.__instruments.count('fetch.failed')
 
     def __run(self) -> None:
-        welcome()
+        welcome(self.__output)
         while not self.__first_menu.run() == (True, False):
 
             if self.__key is None:
-                error_message()
+                error_message(self.__output)
 
-            self.fetch_events()
+            if not self.__warm_start():
+                self.fetch_events(wait=False)
             self.__menu.run()
 
-        goodbye()
+        goodbye(self.__output)
 
     def run(self) -> None:
      try:
@@ -168,67 +354,65 @@ class App:
      except:
         print('Panic error!', file=sys.stderr)
 
-    @staticmethod
-    def __read(prompt: str, builder: Callable) -> Any:
+     finally:
+        self.__output.flush()
+        self.__api.close()
+
+    def __read(self, prompt: str, builder: Callable) -> Any:
         while True:
             try:
-                line = input(f'{prompt}: ')
-                if prompt == "Start date" or prompt == "End date":
-                    line = datetime.strptime(line, '%m/%d/%yT%H:%M:%SZ')
-                    res = builder(line)
-                    return res
-                if prompt == "Category" or prompt == "Priority":
-                    line = int(line)
-                    res = builder(line)
-                    return res
-                else:
-                    res = builder(line.strip())
-                    return res
-            except (TypeError, ValueError, ValidationError) as e:
-                print(e)
+                return parse_value(prompt, self.__output.read(f'{prompt}: '), builder)
+            except READ_ERRORS as e:
+                self.__output.print(e)
 
     def __read_event(self) -> Tuple[Name, Description, Date, Date, Location, Category, Priority]:
-        name = self.__read('Name', Name)
-        description = self.__read('Description', Description)
-        start_date = self.__read('Start date', Date)
-        end_date = self.__read('End date', Date)
-        location = self.__read('Location', Location)
-        category = self.__read('Category', Category)
-        priority = self.__read('Priority', Priority)
-        return name, description, start_date, end_date, location, category, priority
-
-    def logout(self):
-        res = requests.post(url=f'{api_server}/auth/logout/', headers={'Authorization': f'Token {self.__key}'})
+        return tuple(self.__read(prompt, builder) for prompt, builder in EVENT_PROMPTS)
+
+    def logout(self, invalidate_cache: bool = True):
+        self.flush()
+        if not invalidate_cache:
+            self.wait()
+        with self.__lock:
+            self.__key = None
+        self.wait()
+        res = self.__api.logout()
         if res.status_code == 200:
-            print('Logged out!')
+            self.__output.print('Logged out!')
         else:
-            print('Log out failed')
-        print()
-        self.__key = None
-        self.__toDoList.clear()
+            self.__output.print('Log out failed')
+        self.__output.print()
+        self.__etag = None
+        self.__modified_since = None
+        self.__api.forget()
+        if invalidate_cache:
+            self.__cache.invalidate(self.username)
+        with self.__lock:
+            self.__toDoList.clear()
+        self.__view.clear()
 
 
 def main(name: str):
     if name == '__main__':
-        App().run()
+        App(ApiClient(ApiConfig(api_server), Instruments(MemorySink()), TraceLog())).run()
 
 
-def welcome():
-    print(
+def welcome(output: Output) -> None:
+    output.print(
         '================================================================================= ToDoList TUI ===============================================================================')
-    print(
+    output.print(
         '=================================================================== Because we love the \'80s so much! =======================================================================')
-    print(
+    output.print(
         '============================================================================================================================================================================\n')
 
 
-def error_message():
-    print('Unable to retrieve events at the moment. Please, try in a few minutes.')
+def error_message(output: Output) -> None:
+    output.print('Unable to retrieve events at the moment. Please, try in a few minutes.')
+    output.flush()
     exit()
 
 
-def goodbye():
-    print('It was nice to have your here. Have a nice day!\n')
+def goodbye(output: Output) -> None:
+    output.print('It was nice to have your here. Have a nice day!\n')
 
 
 main(__name__)
@@ -0,0 +1,85 @@
+import os
+from pathlib import Path
+from typing import Iterable, List
+
+from validation.typechecking import typechecked
+
+FIELDS = ('id', 'name', 'description', 'author', 'start_date', 'end_date', 'location', 'category', 'priority')
+INT_FIELDS = ('id', 'author', 'category', 'priority')
+
+
+@typechecked
+class EventCache:
+    version = 1
+
+    def __init__(self, path: Path, delimiter: str = '\t'):
+        self.__path = path
+        self.__delimiter = delimiter
+
+    @property
+    def path(self) -> Path:
+        return self.__path
+
+    def __header(self) -> str:
+        return f'# todolist-cache v{self.version}\n'
+
+    def __read(self) -> List[List[str]]:
+        if not self.__path.exists():
+            return []
+        try:
+            with open(self.__path, encoding='utf-8') as file:
+                lines = iter(file)
+                if next(lines, None) != self.__header():
+                    return []
+                return [line.rstrip('\n').split(self.__delimiter) for line in lines]
+        except (OSError, UnicodeDecodeError):
+            return []
+
+    def __write(self, rows: Iterable[List[str]]) -> None:
+        tmp = self.__path.with_name(self.__path.name + '.tmp')
+        try:
+            with open(tmp, 'w', encoding='utf-8') as file:
+                file.write(self.__header())
+                for row in rows:
+                    file.write(self.__delimiter.join(row) + '\n')
+            os.replace(tmp, self.__path)
+        except OSError:
+            pass
+
+    def load(self, user: str) -> List[dict]:
+        res = []
+        for row in self.__read():
+            if len(row) != len(FIELDS) + 1 or row[0] != user:
+                continue
+            item = dict(zip(FIELDS, row[1:]))
+            try:
+                for key in INT_FIELDS:
+                    item[key] = int(item[key])
+            except ValueError:
+                continue
+            res.append(item)
+        return res
+
+    def save(self, user: str, items: Iterable[dict]) -> None:
+        others = [row for row in self.__read() if row and row[0] != user]
+        mine = ([user] + [str(item[key]) for key in FIELDS] for item in items)
+        self.__write(others + list(mine))
+
+    def invalidate(self, user: str) -> None:
+        rows = self.__read()
+        if any(row and row[0] == user for row in rows):
+            self.__write(row for row in rows if row and row[0] != user)
+
+
+class NullCache(EventCache):
+    def __init__(self):
+        super().__init__(Path(os.devnull))
+
+    def load(self, user: str) -> List[dict]:
+        return []
+
+    def save(self, user: str, items: Iterable[dict]) -> None:
+        pass
+
+    def invalidate(self, user: str) -> None:
+        pass
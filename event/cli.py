@@ -0,0 +1,162 @@
+import argparse
+import json
+import os
+import sys
+from contextlib import contextmanager
+from io import StringIO
+from pathlib import Path
+from typing import Iterator, List, Optional, TextIO
+
+from valid8 import ValidationError
+
+from event.api import ApiClient, ApiConfig, api_server
+from event.app import App
+from event.cache import EventCache, NullCache
+from event.dates import parse_iso
+from event.domain import Name, Description, Author, Date, Location, Category, Priority, Event
+from event.output import Output
+from event.transfer import Importer, export_tsv, export_jsonl
+from validation.levels import boundary
+
+FORMATS = ('jsonl', 'tsv')
+ORDERS = {'insertion': None, 'start_date': 'sort_by_start_date', 'priority': 'sort_by_priority'}
+
+
+class CliError(Exception):
+    pass
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='todolist', description='Non-interactive access to the To Do List.')
+    parser.add_argument('--url', default=os.environ.get('TODOLIST_URL', api_server))
+    parser.add_argument('--username', default=os.environ.get('TODOLIST_USERNAME'))
+    parser.add_argument('--password', default=os.environ.get('TODOLIST_PASSWORD'))
+    parser.add_argument('--cache', type=Path, default=None)
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    list_command = commands.add_parser('list')
+    list_command.add_argument('--format', choices=FORMATS, default='jsonl')
+
+    sort_command = commands.add_parser('sort')
+    sort_command.add_argument('order', choices=sorted(ORDERS))
+    sort_command.add_argument('--format', choices=FORMATS, default='jsonl')
+
+    add_command = commands.add_parser('add')
+    for name in ('name', 'description', 'start', 'end', 'location'):
+        add_command.add_argument(f'--{name}', required=True)
+    add_command.add_argument('--category', type=int, required=True)
+    add_command.add_argument('--priority', type=int, required=True)
+
+    remove_command = commands.add_parser('remove')
+    remove_command.add_argument('ids', type=int, nargs='+')
+
+    import_command = commands.add_parser('import')
+    import_command.add_argument('file')
+    import_command.add_argument('--format', choices=FORMATS, default='jsonl')
+    import_command.add_argument('--chunk-size', type=int, default=500)
+
+    export_command = commands.add_parser('export')
+    export_command.add_argument('file')
+    export_command.add_argument('--format', choices=FORMATS, default='jsonl')
+    return parser
+
+
+@contextmanager
+def _open(file: str, mode: str, stdio: TextIO) -> Iterator[TextIO]:
+    if file == '-':
+        yield stdio
+        return
+    with open(file, mode, encoding='utf-8', newline='') as res:
+        yield res
+
+
+def _emit(output: Output, value: dict) -> None:
+    output.print(json.dumps(value))
+
+
+def _write_events(app: App, file: TextIO, format: str) -> int:
+    events = (app.toDoList.event(index) for index in range(app.toDoList.events()))
+    return export_tsv(events, file) if format == 'tsv' else export_jsonl(events, file)
+
+
+def _fetch(app: App) -> None:
+    if app.fetch_events() is None:
+        raise CliError('Unable to retrieve events')
+
+
+def _run(app: App, args: argparse.Namespace, output: Output, stdin: TextIO, stdout: TextIO) -> int:
+    if args.command in ('list', 'sort'):
+        _fetch(app)
+        order = ORDERS[args.order] if args.command == 'sort' else None
+        if order is not None:
+            getattr(app.toDoList, order)()
+        output.flush()
+        _write_events(app, stdout, args.format)
+        return 0
+
+    if args.command == 'export':
+        _fetch(app)
+        with _open(args.file, 'w', stdout) as file:
+            count = _write_events(app, file, args.format)
+        if args.file != '-':
+            _emit(output, {'exported': count})
+        return 0
+
+    if args.command == 'add':
+        with boundary():
+            event = Event(-1, Name(args.name), Description(args.description), Author(app.author_id),
+                          Date(parse_iso(args.start)), Date(parse_iso(args.end)), Location(args.location),
+                          Category(args.category), Priority(args.priority))
+        created = app.add_event(event)
+        if created is None:
+            raise CliError('Unable to add event')
+        app.flush()
+        _emit(output, created.to_row())
+        return 0
+
+    if args.command == 'remove':
+        removed = [app.api.delete_event(id).status_code in (200, 204) for id in args.ids]
+        for id, ok in zip(args.ids, removed):
+            _emit(output, {'id': id, 'removed': ok})
+        return 0 if all(removed) else 1
+
+    importer = Importer(app.api, chunk_size=args.chunk_size)
+    with _open(args.file, 'r', stdin) as file:
+        report = importer.import_tsv(file, app.author_id) if args.format == 'tsv' else \
+            importer.import_jsonl(file, app.author_id)
+    _emit(output, {'imported': report.imported, 'failed': report.failed,
+                   'errors': [{'line': error.line, 'message': error.message} for error in report.errors]})
+    return 0 if not report.failed else 1
+
+
+def main(argv: Optional[List[str]] = None, stdin: Optional[TextIO] = None, stdout: Optional[TextIO] = None,
+         stderr: Optional[TextIO] = None) -> int:
+    stdin = stdin if stdin is not None else sys.stdin
+    stdout = stdout if stdout is not None else sys.stdout
+    stderr = stderr if stderr is not None else sys.stderr
+    parser = _parser()
+    args = parser.parse_args(argv)
+    if args.username is None or args.password is None:
+        parser.error('credentials are required (--username/--password or TODOLIST_USERNAME/TODOLIST_PASSWORD)')
+
+    output, errors = Output(stdout), Output(stderr)
+    app = App(ApiClient(ApiConfig(args.url)), cache=EventCache(args.cache) if args.cache is not None else NullCache(),
+              output=Output(StringIO()))
+    try:
+        if not app.login(args.username, args.password):
+            raise CliError('Wrong credentials')
+        try:
+            return _run(app, args, output, stdin, stdout)
+        finally:
+            app.logout(invalidate_cache=False)
+    except (CliError, OSError, TypeError, ValueError, ValidationError) as e:
+        _emit(errors, {'error': str(e)})
+        return 1
+    finally:
+        output.flush()
+        errors.flush()
+        app.api.close()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
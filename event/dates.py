@@ -0,0 +1,44 @@
+from datetime import datetime, timezone
+from functools import lru_cache
+
+from validation.registry import registry
+
+SERVER_FORMAT = '%Y-%m-%dT%H:%M:%SZ'
+INPUT_FORMAT = '%m/%d/%yT%H:%M:%SZ'
+CACHE_SIZE = 4096
+
+_SERVER = registry.compiled(r'^([0-9]{4})-([0-9]{2})-([0-9]{2})T([0-9]{2}):([0-9]{2}):([0-9]{2})Z$')
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def parse_server(value: str) -> datetime:
+    match = _SERVER.match(value)
+    if match is None:
+        return datetime.strptime(value, SERVER_FORMAT)
+    year, month, day, hour, minute, second = match.groups()
+    return datetime(int(year), int(month), int(day), int(hour), int(minute), int(second))
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def parse_input(value: str) -> datetime:
+    return datetime.strptime(value, INPUT_FORMAT)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def parse_iso(value: str) -> datetime:
+    return to_utc(datetime.fromisoformat(value))
+
+
+def to_utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def format_server(value: datetime) -> str:
+    return to_utc(value).strftime(SERVER_FORMAT)
+
+
+def clear_cache() -> None:
+    for parse in (parse_server, parse_input, parse_iso):
+        parse.cache_clear()
@@ -1,15 +1,43 @@
 import json
 import re
+import sys
+import time
 
+from bisect import bisect_left, insort
+from contextlib import contextmanager
+from contextvars import ContextVar
 from dataclasses import dataclass, field, InitVar
-from datetime import datetime
-from typing import List, Union, Any
+from datetime import datetime, timedelta
+from itertools import count
+from typing import List, Union, Any, Iterable, Callable, Iterator, Dict, Tuple, Optional, Set
 
-from typeguard import typechecked
 from valid8 import validate
 
+from event.dates import parse_server, parse_input, format_server, to_utc
+from event.metrics import Instruments, DISABLED, TimedIterator
 from validation.dataclasses import validate_dataclass
+from validation.levels import boundary, enabled
 from validation.regex import pattern
+from validation.registry import registry
+from validation.typechecking import typechecked, typeguard_ignore
+
+_TEXT = registry.compiled(r'^[a-zA-Z0-9 ]+$')
+_text_pattern = pattern(r'^[a-zA-Z0-9 ]+$')
+
+
+def _trusted(cls, **values):
+    res = object.__new__(cls)
+    for key, value in values.items():
+        object.__setattr__(res, key, value)
+    return res
+
+
+def _is_text(value: Any, max_len: int) -> bool:
+    return type(value) is str and 0 < len(value) <= max_len and _TEXT.fullmatch(value) is not None
+
+
+def _is_int_in(value: Any, min_value: int, max_value: int) -> bool:
+    return type(value) is int and min_value <= value <= max_value
 
 
 @typechecked
@@ -18,8 +46,10 @@ class Name:
     value: str
 
     def __post_init__(self):
+        if not enabled():
+            return
         validate_dataclass(self)
-        validate('name', self.value, max_len=50, custom=pattern(r'^[a-zA-Z0-9 ]+$'))
+        validate('name', self.value, max_len=50, custom=_text_pattern)
 
     def __str__(self):
         return self.value
@@ -31,8 +61,10 @@ class Description:
     value: str
 
     def __post_init__(self):
+        if not enabled():
+            return
         validate_dataclass(self)
-        validate('description', self.value, max_len=500, custom=pattern(r'^[a-zA-Z0-9 ]+$'))
+        validate('description', self.value, max_len=500, custom=_text_pattern)
 
     def __str__(self):
         return self.value
@@ -44,6 +76,8 @@ class Author:
     key: int
 
     def __post_init__(self):
+        if not enabled():
+            return
         validate_dataclass(self)
         validate('key', self.key)
 
@@ -51,18 +85,50 @@ class Author:
         return str(self.key)
 
 
+USER_INPUT = 'user input'
+SERVER_LOAD = 'server load'
+
+_date_context: ContextVar[Optional[Tuple[str, Optional[datetime]]]] = ContextVar('date_context', default=None)
+
+
+@contextmanager
+def date_context(mode: str = USER_INPUT, now: Optional[datetime] = None) -> Iterator[Optional[datetime]]:
+    validate('mode', mode, is_in={USER_INPUT, SERVER_LOAD})
+    if mode == USER_INPUT and now is None:
+        now = datetime.now()
+    token = _date_context.set((mode, now))
+    try:
+        yield now
+    finally:
+        _date_context.reset(token)
+
+
 @typechecked
 @dataclass(frozen=True, order=True)
 class Date:
     date: datetime
 
     def __post_init__(self):
+        if not enabled():
+            return
         validate_dataclass(self)
-        validate('date', self.date, min_value=datetime.now())
+        context = _date_context.get()
+        if context is None:
+            validate('date', self.date, min_value=datetime.now())
+        elif context[0] == USER_INPUT:
+            validate('date', self.date, min_value=context[1])
 
     def __str__(self):
         return str(self.date)
 
+    @staticmethod
+    def from_input(value: str) -> 'Date':
+        with boundary():
+            return Date(parse_input(value))
+
+    def to_server(self) -> str:
+        return format_server(self.date)
+
 
 
 @typechecked
@@ -71,8 +137,10 @@ class Location:
     value: str
 
     def __post_init__(self,):
+        if not enabled():
+            return
         validate_dataclass(self)
-        validate('location', self.value, max_len=50, custom=pattern(r'^[a-zA-Z0-9 ]+$'))
+        validate('location', self.value, max_len=50, custom=_text_pattern)
 
     def __str__(self):
         return self.value
@@ -83,6 +151,8 @@ class Category:
     value: int
 
     def __post_init__(self,):
+        if not enabled():
+            return
         validate_dataclass(self)
         validate('category', self.value, min_value=0, max_value=3)
 
@@ -96,6 +166,8 @@ class Priority:
     value: int
 
     def __post_init__(self,):
+        if not enabled():
+            return
         validate_dataclass(self)
         validate('priority', self.value,min_value=0, max_value=2)
 
@@ -123,36 +195,373 @@ class Event:
                    '\t' + str(self.location) + '\t' + str(self.category) + '\t' + str(self.priority) + '\n')
 
     def __post_init__(self, ):
+        if not enabled():
+            return
         validate_dataclass(self)
         validate('date', self.end_date, min_value=self.start_date)
 
+    def to_row(self) -> dict:
+        return {'id': self.id, 'name': self.name.value, 'description': self.description.value,
+                'author': self.author.key, 'start_date': self.start_date.to_server(),
+                'end_date': self.end_date.to_server(), 'location': self.location.value,
+                'category': self.category.value, 'priority': self.priority.value}
+
+    @staticmethod
+    def from_trusted_dict(item: dict) -> 'Event':
+        return Event.from_rows([item])[0]
+
+    @staticmethod
+    def from_rows(rows: Iterable[dict]) -> List['Event']:
+        return [_event_from_fields(*_parse_row(item)) for item in rows]
+
+
+def _event_from_fields(id: int, name: str, description: str, author: int, start_date: datetime, end_date: datetime,
+                       location: str, category: int, priority: int) -> Event:
+    return _trusted(Event, id=id, name=_trusted(Name, value=name), description=_trusted(Description, value=description),
+                    author=_trusted(Author, key=author), start_date=_trusted(Date, date=start_date),
+                    end_date=_trusted(Date, date=end_date), location=_trusted(Location, value=location),
+                    category=_trusted(Category, value=category), priority=_trusted(Priority, value=priority))
+
+
+def _parse_row(item: dict) -> tuple:
+    start_date = parse_server(item['start_date'])
+    end_date = parse_server(item['end_date'])
+    if not (_is_text(item['name'], 50) and _is_text(item['description'], 500) and
+            _is_text(item['location'], 50) and type(item['author']) is int and
+            _is_int_in(item['category'], 0, 3) and _is_int_in(item['priority'], 0, 2) and
+            start_date <= end_date):
+        with date_context(SERVER_LOAD), boundary():
+            Event(int(item['id']), Name(item['name']), Description(item['description']), Author(item['author']),
+                  Date(start_date), Date(end_date), Location(item['location']), Category(item['category']),
+                  Priority(item['priority']))
+    return (int(item['id']), item['name'], item['description'], item['author'], start_date, end_date,
+            item['location'], item['category'], item['priority'])
+
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def _to_epoch(value: datetime) -> int:
+    return (to_utc(value) - _EPOCH) // _MICROSECOND
+
+
+def _from_epoch(value: int) -> datetime:
+    return _EPOCH + value * _MICROSECOND
+
+
+class EventRecord:
+    __slots__ = ('id', 'name', 'description', 'author', 'start', 'end', 'location', 'category', 'priority')
+
+    def __init__(self, id: int, name: str, description: str, author: int, start: int, end: int, location: str,
+                 category: int, priority: int):
+        self.id = id
+        self.name = sys.intern(name)
+        self.description = sys.intern(description)
+        self.author = author
+        self.start = start
+        self.end = end
+        self.location = sys.intern(location)
+        self.category = category
+        self.priority = priority
+
+    @staticmethod
+    def from_event(event: Event) -> 'EventRecord':
+        return EventRecord(event.id, event.name.value, event.description.value, event.author.key,
+                           _to_epoch(event.start_date.date), _to_epoch(event.end_date.date), event.location.value,
+                           event.category.value, event.priority.value)
+
+    @staticmethod
+    def from_rows(rows: Iterable[dict]) -> List['EventRecord']:
+        return [_record_from_fields(*_parse_row(item)) for item in rows]
+
+    def to_event(self) -> Event:
+        return _event_from_fields(self.id, self.name, self.description, self.author, _from_epoch(self.start),
+                                  _from_epoch(self.end), self.location, self.category, self.priority)
+
+
+def _record_from_fields(id: int, name: str, description: str, author: int, start_date: datetime, end_date: datetime,
+                        location: str, category: int, priority: int) -> EventRecord:
+    return EventRecord(id, name, description, author, _to_epoch(start_date), _to_epoch(end_date), location, category,
+                       priority)
+
+
+def _start_of(entry: Union[Event, EventRecord]) -> int:
+    return entry.start if type(entry) is EventRecord else _to_epoch(entry.start_date.date)
+
+
+def _end_of(entry: Union[Event, EventRecord]) -> int:
+    return entry.end if type(entry) is EventRecord else _to_epoch(entry.end_date.date)
+
+
+def _priority_of(entry: Union[Event, EventRecord]) -> int:
+    return entry.priority if type(entry) is EventRecord else entry.priority.value
+
+
+def _category_of(entry: Union[Event, EventRecord]) -> int:
+    return entry.category if type(entry) is EventRecord else entry.category.value
+
+
+def _author_of(entry: Union[Event, EventRecord]) -> int:
+    return entry.author if type(entry) is EventRecord else entry.author.key
+
+
+def _location_of(entry: Union[Event, EventRecord]) -> str:
+    return entry.location if type(entry) is EventRecord else entry.location.value
+
+
+class _SortedIndex:
+    def __init__(self, key: Callable[[int, Any], tuple]):
+        self.__key = key
+        self.__keys: List[tuple] = []
+
+    def __len__(self) -> int:
+        return len(self.__keys)
+
+    def __getitem__(self, index: int) -> int:
+        return self.__keys[index][-1]
+
+    def __iter__(self) -> Iterator[int]:
+        return iter([key[-1] for key in self.__keys])
+
+    def add(self, seq: int, entry: Any) -> None:
+        insort(self.__keys, self.__key(seq, entry))
+
+    def remove(self, seq: int, entry: Any) -> None:
+        del self.__keys[bisect_left(self.__keys, self.__key(seq, entry))]
+
+    def remove_all(self, entries: Dict[int, Any]) -> None:
+        self.__keys[:] = [key for key in self.__keys if key[-1] not in entries]
+
+    def from_key(self, key: tuple, count: int) -> List[int]:
+        index = bisect_left(self.__keys, key)
+        return [key[-1] for key in self.__keys[index:index + count]]
+
+    def count_before(self, key: tuple) -> int:
+        return bisect_left(self.__keys, key)
+
+    def before(self, key: tuple) -> List[int]:
+        return [key[-1] for key in self.__keys[:bisect_left(self.__keys, key)]]
+
+    def from_key_on(self, key: tuple) -> List[int]:
+        return [key[-1] for key in self.__keys[bisect_left(self.__keys, key):]]
+
+    def clear(self) -> None:
+        self.__keys.clear()
+
+
+class _ValueIndex:
+    def __init__(self, key: Callable[[Any], Any]):
+        self.__key = key
+        self.__seqs: Dict[Any, Set[int]] = {}
+
+    def get(self, value: Any) -> Set[int]:
+        return self.__seqs.get(value, set())
+
+    def add(self, seq: int, entry: Any) -> None:
+        self.__seqs.setdefault(self.__key(entry), set()).add(seq)
+
+    def remove(self, seq: int, entry: Any) -> None:
+        value = self.__key(entry)
+        seqs = self.__seqs[value]
+        seqs.discard(seq)
+        if not seqs:
+            del self.__seqs[value]
+
+    def remove_all(self, entries: Dict[int, Any]) -> None:
+        for seq, entry in entries.items():
+            self.remove(seq, entry)
+
+    def clear(self) -> None:
+        self.__seqs.clear()
+
 
 @typechecked
 @dataclass(frozen=True)
 class ToDoList:
-    __events: List[Event] = field(default_factory=list, init=False)
+    compact: bool = False
+    instruments: Instruments = field(default=DISABLED, compare=False, repr=False)
+    __by_insertion: _SortedIndex = field(default_factory=lambda: _SortedIndex(lambda seq, e: (seq,)), init=False,
+                                         repr=False)
+    __by_start_date: _SortedIndex = field(default_factory=lambda: _SortedIndex(lambda seq, e: (_start_of(e), seq)),
+                                          init=False, repr=False)
+    __by_priority: _SortedIndex = field(default_factory=lambda: _SortedIndex(lambda seq, e: (-_priority_of(e), seq)),
+                                        init=False, repr=False)
+    __by_end_date: _SortedIndex = field(default_factory=lambda: _SortedIndex(lambda seq, e: (_end_of(e), seq)),
+                                        init=False, repr=False)
+    __by_category: _ValueIndex = field(default_factory=lambda: _ValueIndex(_category_of), init=False, repr=False)
+    __by_priority_value: _ValueIndex = field(default_factory=lambda: _ValueIndex(_priority_of), init=False,
+                                             repr=False)
+    __by_author: _ValueIndex = field(default_factory=lambda: _ValueIndex(_author_of), init=False, repr=False)
+    __by_seq: Dict[int, Any] = field(default_factory=dict, init=False, repr=False)
+    __by_id: Dict[int, int] = field(default_factory=dict, init=False, repr=False)
+    __next_seq: Iterator[int] = field(default_factory=count, init=False, repr=False)
+    __view: List[_SortedIndex] = field(default_factory=list, init=False, repr=False)
+
+    def __post_init__(self):
+        self.__view.append(self.__by_insertion)
+
+    @typeguard_ignore
+    def __indexes(self) -> Tuple[Union[_SortedIndex, _ValueIndex], ...]:
+        return (self.__by_insertion, self.__by_start_date, self.__by_priority, self.__by_end_date,
+                self.__by_category, self.__by_priority_value, self.__by_author)
+
+    @typeguard_ignore
+    def __materialize(self, seq: int) -> Event:
+        entry = self.__by_seq[seq]
+        return entry.to_event() if self.compact else entry
+
+    @typeguard_ignore
+    def __materialize_all(self, seqs: Iterable[int]) -> Iterator[Event]:
+        return (self.__materialize(seq) for seq in seqs)
+
+    @typeguard_ignore
+    def __add(self, seq: int, entry: Union[Event, EventRecord]) -> None:
+        self.__by_seq[seq] = entry
+        self.__by_id[entry.id] = seq
+        for index in self.__indexes():
+            index.add(seq, entry)
+
+    @typeguard_ignore
+    def __remove(self, seq: int) -> None:
+        entry = self.__by_seq.pop(seq)
+        if self.__by_id.get(entry.id) == seq:
+            del self.__by_id[entry.id]
+        for index in self.__indexes():
+            index.remove(seq, entry)
+
+    @typeguard_ignore
+    def __upsert(self, entry: Union[Event, EventRecord]) -> None:
+        seq = self.__by_id.get(entry.id)
+        if seq is None:
+            self.__add(next(self.__next_seq), entry)
+            return
+        self.__remove(seq)
+        self.__add(seq, entry)
+
+    def __select(self, view: _SortedIndex) -> None:
+        self.__view[0] = view
 
     def clear(self):
-        self.__events.clear()
+        for index in self.__indexes():
+            index.clear()
+        self.__by_seq.clear()
+        self.__by_id.clear()
 
     def events(self) -> int:
-        return len(self.__events)
+        return len(self.__by_seq)
 
     def event(self, index: int):
         validate('index', index, min_value=0, max_value=self.events() - 1)
-        return self.__events[index]
+        return self.__materialize(self.__view[0][index])
 
     def add_event(self, event: Event) -> None:
-        self.__events.append(event)
+        self.__add(next(self.__next_seq), EventRecord.from_event(event) if self.compact else event)
+
+    def upsert_event(self, event: Event) -> None:
+        self.__upsert(EventRecord.from_event(event) if self.compact else event)
+
+    @typeguard_ignore
+    def __upsert_rows(self, rows: Iterable[dict]) -> int:
+        res = 0
+        for item in rows:
+            fields = _parse_row(item)
+            self.__upsert(_record_from_fields(*fields) if self.compact else _event_from_fields(*fields))
+            res += 1
+        return res
+
+    def upsert_rows(self, rows: Iterable[dict]) -> int:
+        if not self.instruments.enabled:
+            return self.__upsert_rows(rows)
+        source = TimedIterator(rows)
+        start = time.perf_counter()
+        res = self.__upsert_rows(source)
+        self.instruments.observe('domain.upsert_rows', time.perf_counter() - start - source.elapsed)
+        self.instruments.count('domain.rows', res)
+        return res
 
     def remove_event(self, index: int) -> None:
         validate('index', index, min_value=0, max_value=self.events() - 1)
-        del self.__events[index]
+        self.__remove(self.__view[0][index])
 
-    def sort_by_start_date(self) -> None:
-        self.__events.sort(key=lambda x: x.start_date)
+    def contains(self, id: int) -> bool:
+        return id in self.__by_id
 
-    def sort_by_priority(self) -> None:
-        self.__events.sort(key=lambda x: x.priority, reverse=True)
+    def ids(self) -> Set[int]:
+        return set(self.__by_id)
+
+    def get_by_id(self, id: int) -> Event:
+        validate('id', id, custom=self.contains)
+        return self.__materialize(self.__by_id[id])
 
+    def remove_by_id(self, id: int) -> None:
+        validate('id', id, custom=self.contains)
+        self.__remove(self.__by_id[id])
 
+    def remove_many(self, ids: Iterable[int]) -> int:
+        with self.instruments.timer('domain.remove_many'):
+            entries = {seq: self.__by_seq.pop(seq)
+                       for seq in {self.__by_id.pop(id) for id in set(ids) if id in self.__by_id}}
+            for index in self.__indexes() if entries else ():
+                index.remove_all(entries)
+        return len(entries)
+
+    def sort_by_start_date(self) -> None:
+        self.__select(self.__by_start_date)
+        self.instruments.count('domain.sort.start_date')
+
+    def sort_by_priority(self) -> None:
+        self.__select(self.__by_priority)
+        self.instruments.count('domain.sort.priority')
+
+    def in_insertion_order(self) -> Iterator[Event]:
+        return self.__materialize_all(self.__by_insertion)
+
+    def by_start_date(self) -> Iterator[Event]:
+        return self.__materialize_all(self.__by_start_date)
+
+    def by_priority(self) -> Iterator[Event]:
+        return self.__materialize_all(self.__by_priority)
+
+    def upcoming(self, count: int, after: Optional[datetime] = None) -> List[Event]:
+        validate('count', count, min_value=0)
+        key = (_to_epoch(after if after is not None else datetime.now()),)
+        return list(self.__materialize_all(self.__by_start_date.from_key(key, count)))
+
+    @typeguard_ignore
+    def __overlapping(self, start: Optional[datetime], end: Optional[datetime]) -> Set[int]:
+        starting_after_end = (_to_epoch(end) + 1,) if end is not None else None
+        ending_before_start = (_to_epoch(start),) if start is not None else None
+        if ending_before_start is None:
+            return set(self.__by_start_date.before(starting_after_end))
+        if starting_after_end is None:
+            return set(self.__by_end_date.from_key_on(ending_before_start))
+        if self.__by_start_date.count_before(starting_after_end) <= \
+                self.events() - self.__by_end_date.count_before(ending_before_start):
+            candidates = self.__by_start_date.before(starting_after_end)
+            return {seq for seq in candidates if _end_of(self.__by_seq[seq]) >= ending_before_start[0]}
+        candidates = self.__by_end_date.from_key_on(ending_before_start)
+        return {seq for seq in candidates if _start_of(self.__by_seq[seq]) < starting_after_end[0]}
+
+    def query(self, start: Optional[datetime] = None, end: Optional[datetime] = None, category: Optional[int] = None,
+              priority: Optional[int] = None, author: Optional[int] = None,
+              location: Optional[str] = None) -> List[Event]:
+        candidates = []
+        if category is not None:
+            candidates.append(self.__by_category.get(category))
+        if priority is not None:
+            candidates.append(self.__by_priority_value.get(priority))
+        if author is not None:
+            candidates.append(self.__by_author.get(author))
+        if start is not None or end is not None:
+            candidates.append(self.__overlapping(start, end))
+        if candidates:
+            candidates.sort(key=len)
+            seqs = candidates[0].intersection(*candidates[1:])
+        else:
+            seqs = self.__by_seq.keys()
+        if location is not None:
+            location = location.lower()
+            seqs = [seq for seq in seqs if location in _location_of(self.__by_seq[seq]).lower()]
+        ordered = sorted(seqs, key=lambda seq: (_start_of(self.__by_seq[seq]), seq))
+        return list(self.__materialize_all(ordered))
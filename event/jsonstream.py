@@ -0,0 +1,49 @@
+import codecs
+import json
+from typing import Any, Iterable, Iterator, Union
+
+_WHITESPACE = ' \t\n\r'
+_NUMBER = '0123456789+-.eE'
+
+
+def _may_continue(buffer: str, end: int) -> bool:
+    while end < len(buffer) and buffer[end] in _NUMBER:
+        end += 1
+    return end == len(buffer)
+
+
+def iter_array(chunks: Iterable[Union[str, bytes]]) -> Iterator[Any]:
+    decoder = json.JSONDecoder()
+    text = codecs.getincrementaldecoder('utf-8')()
+    buffer = ''
+    expected = '['
+    for chunk in chunks:
+        buffer += text.decode(chunk) if isinstance(chunk, bytes) else chunk
+        pos = 0
+        while True:
+            while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                pos += 1
+            if pos == len(buffer):
+                break
+            char = buffer[pos]
+            if expected == '[':
+                if char != '[':
+                    raise ValueError(f'Expected a JSON array, found {char!r}')
+                expected, pos = 'first', pos + 1
+            elif char == ']' and expected in ('first', ','):
+                return
+            elif expected == ',':
+                if char != ',':
+                    raise ValueError(f'Expected "," or "]", found {char!r}')
+                expected, pos = 'item', pos + 1
+            else:
+                try:
+                    item, end = decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError:
+                    break
+                if not isinstance(item, (dict, list, str)) and _may_continue(buffer, end):
+                    break
+                yield item
+                expected, pos = ',', end
+        buffer = buffer[pos:]
+    raise ValueError('Truncated JSON array')
@@ -1,11 +1,16 @@
 from dataclasses import field, InitVar, dataclass
 from typing import Callable, List, Dict, Optional, Any
 
-from typeguard import typechecked
 from valid8 import validate
 
+from event.output import Output
 from validation.dataclasses import validate_dataclass
+from validation.levels import enabled
 from validation.regex import pattern
+from validation.typechecking import typechecked
+
+_description_pattern = pattern(r'[0-9A-Za-z ;.,_-]*')
+_key_pattern = pattern(r'[0-9A-Za-z_-]*')
 
 
 @typechecked
@@ -14,8 +19,10 @@ class MenuDescription:
     value: str
 
     def __post_init__(self):
+        if not enabled():
+            return
         validate_dataclass(self)
-        validate('MenuDescription.value', self.value, min_len=1, max_len=1000, custom=pattern(r'[0-9A-Za-z ;.,_-]*'))
+        validate('MenuDescription.value', self.value, min_len=1, max_len=1000, custom=_description_pattern)
 
     def __str__(self):
         return self.value
@@ -27,8 +34,10 @@ class Key:
     value: str
 
     def __post_init__(self):
+        if not enabled():
+            return
         validate_dataclass(self)
-        validate('Key.value', self.value, min_len=1, max_len=10, custom=pattern(r'[0-9A-Za-z_-]*'))
+        validate('Key.value', self.value, min_len=1, max_len=10, custom=_key_pattern)
 
     def __str__(self):
         return self.value
@@ -44,6 +53,8 @@ class Entry:
     is_logged: Callable[[], bool] = field(default=lambda: False)
 
     def __post_init__(self):
+        if not enabled():
+            return
         validate_dataclass(self)
 
     @staticmethod
@@ -57,8 +68,10 @@ class Entry:
 class Menu:
     description: MenuDescription
     auto_select: Callable[[], None] = field(default=lambda: None)
+    output: Output = field(default_factory=Output, repr=False, compare=False)
     __entries: List[Entry] = field(default_factory=list, repr=False, init=False)
     __key2entry: Dict[Key, Entry] = field(default_factory=dict, repr=False, init=False)
+    __rendered: List[str] = field(default_factory=list, repr=False, init=False)
     create_key: InitVar[Any] = field(default=None)
 
     def __post_init__(self, create_key: Any):
@@ -74,27 +87,38 @@ class Menu:
     def _has_exit(self) -> bool:
         return bool(list(filter(lambda e: e.is_exit, self.__entries)))
 
-    def __print(self) -> None:
+    def _render(self, create_key: Any) -> None:
+        validate('create_key', create_key, custom=Menu.Builder.is_valid_key)
         length = len(str(self.description))
         fmt = '***{}{}{}***'
-        print(fmt.format('*', '*' * length, '*'))
-        print(fmt.format(' ', self.description.value, ' '))
-        print(fmt.format('*', '*' * length, '*'))
+        border = fmt.format('*', '*' * length, '*')
+        self.__rendered[:] = ['\n'.join([border, fmt.format(' ', self.description.value, ' '), border]),
+                              '\n'.join(f'{entry.key}:\t{entry.description}' for entry in self.__entries)]
+
+    def __print(self) -> None:
+        header, entries = self.__rendered
+        self.output.print(header)
         self.auto_select()
-        for entry in self.__entries:
-            print(f'{entry.key}:\t{entry.description}')
+        self.output.print(entries)
+        self.output.flush()
+
+    def show(self) -> None:
+        self.__print()
+
+    def entry(self, key: Key) -> Entry:
+        return self.__key2entry[key]
 
     def __select_from_input(self) -> (bool, bool):
         while True:
             try:
-                line = input("? ")
+                line = self.output.read("? ")
                 key = Key(line.strip())
                 entry = self.__key2entry[key]
                 entry.on_selected()
                 return entry.is_exit, entry.is_logged()
             except (KeyError, TypeError, ValueError) as e:
-                print (e)
-                print('Invalid selection. Please, try again...')
+                self.output.print(e)
+                self.output.print('Invalid selection. Please, try again...')
 
     def run(self) -> (bool, bool):
         while True:
@@ -109,8 +133,9 @@ class Menu:
         __menu: Optional['Menu']
         __create_key = object()
 
-        def __init__(self, description: MenuDescription, auto_select: Callable[[], None] = lambda: None):
-            self.__menu = Menu(description, auto_select, self.__create_key)
+        def __init__(self, description: MenuDescription, auto_select: Callable[[], None] = lambda: None,
+                     output: Optional[Output] = None):
+            self.__menu = Menu(description, auto_select, output if output is not None else Output(), self.__create_key)
 
         @staticmethod
         def is_valid_key(key: Any) -> bool:
@@ -124,5 +149,6 @@ class Menu:
         def build(self) -> 'Menu':
             validate('menu', self.__menu)
             validate('menu.entries', self.__menu._has_exit(), equals=True)
+            self.__menu._render(self.__create_key)
             res, self.__menu = self.__menu, None
             return res
\ No newline at end of file
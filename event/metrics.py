@@ -0,0 +1,225 @@
+import json
+import re
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+from typing import Any, ContextManager, Dict, Iterable, Iterator, List, Optional, Protocol, Union
+
+COUNTER = 'counter'
+TIMER = 'timer'
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Sink(Protocol):
+    def record(self, kind: str, name: str, value: float) -> None: ...
+
+
+@dataclass
+class TimerStats:
+    count: int = 0
+    total: float = 0.0
+    min: float = float('inf')
+    max: float = 0.0
+    buckets: List[int] = field(default_factory=lambda: [0] * (len(LATENCY_BUCKETS) + 1))
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        self.buckets[bisect_left(LATENCY_BUCKETS, value)] += 1
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def quantile(self, q: float) -> float:
+        rank, seen = q * self.count, 0
+        for bound, observations in zip(LATENCY_BUCKETS, self.buckets):
+            seen += observations
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+
+class MemorySink:
+    def __init__(self):
+        self.__lock = threading.Lock()
+        self.__counters: Dict[str, float] = {}
+        self.__timers: Dict[str, TimerStats] = {}
+
+    def record(self, kind: str, name: str, value: float) -> None:
+        with self.__lock:
+            if kind == COUNTER:
+                self.__counters[name] = self.__counters.get(name, 0) + value
+            else:
+                self.__timers.setdefault(name, TimerStats()).add(value)
+
+    def counters(self) -> Dict[str, float]:
+        with self.__lock:
+            return dict(self.__counters)
+
+    def timers(self) -> Dict[str, TimerStats]:
+        with self.__lock:
+            return {name: TimerStats(stats.count, stats.total, stats.min, stats.max, list(stats.buckets))
+                    for name, stats in self.__timers.items()}
+
+    def clear(self) -> None:
+        with self.__lock:
+            self.__counters.clear()
+            self.__timers.clear()
+
+
+class LogSink:
+    def __init__(self, path: Path):
+        self.__file = open(path, 'a', encoding='utf-8')
+        self.__lock = threading.Lock()
+
+    def record(self, kind: str, name: str, value: float) -> None:
+        line = f'{time.time():.6f}\t{kind}\t{name}\t{value:.9g}\n'
+        with self.__lock:
+            self.__file.write(line)
+
+    def flush(self) -> None:
+        with self.__lock:
+            self.__file.flush()
+
+    def close(self) -> None:
+        with self.__lock:
+            self.__file.close()
+
+    def __enter__(self) -> 'LogSink':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+def _metric_name(name: str) -> str:
+    return 'todolist_' + re.sub(r'[^a-zA-Z0-9_]', '_', name)
+
+
+class PrometheusSink(MemorySink):
+    def render(self) -> str:
+        lines = []
+        for name, value in sorted(self.counters().items()):
+            metric = _metric_name(name) + '_total'
+            lines += [f'# TYPE {metric} counter', f'{metric} {value:.9g}']
+        for name, stats in sorted(self.timers().items()):
+            metric = _metric_name(name) + '_seconds'
+            lines.append(f'# TYPE {metric} histogram')
+            seen = 0
+            for bound, observations in zip(LATENCY_BUCKETS, stats.buckets):
+                seen += observations
+                lines.append(f'{metric}_bucket{{le="{bound}"}} {seen}')
+            lines += [f'{metric}_bucket{{le="+Inf"}} {stats.count}', f'{metric}_sum {stats.total:.9g}',
+                      f'{metric}_count {stats.count}']
+        return '\n'.join(lines) + '\n' if lines else ''
+
+    def dump(self, path: Path) -> None:
+        path.write_text(self.render(), encoding='utf-8')
+
+
+def summary(sink: MemorySink) -> str:
+    lines = [f'{"Timer":<32}{"Calls":>8}{"Mean ms":>10}{"p50 ms":>10}{"p95 ms":>10}{"Max ms":>10}']
+    for name, stats in sorted(sink.timers().items()):
+        lines.append(f'{name:<32}{stats.count:>8}{stats.mean * 1000:>10.1f}{stats.quantile(0.5) * 1000:>10.1f}'
+                     f'{stats.quantile(0.95) * 1000:>10.1f}{stats.max * 1000:>10.1f}')
+    lines.append(f'{"Counter":<32}{"Value":>8}')
+    for name, value in sorted(sink.counters().items()):
+        lines.append(f'{name:<32}{value:>8.9g}')
+    return '\n'.join(lines)
+
+
+@dataclass(frozen=True)
+class Trace:
+    time: float
+    method: str
+    url: str
+    status: Union[int, str]
+    seconds: float
+    sent: int
+    received: int
+
+    def __str__(self) -> str:
+        return f'{self.method:<7}{self.url:<48}{self.status!s:>6}{self.seconds * 1000:>10.1f} ms' \
+               f'{self.sent:>8} B out{self.received:>8} B in'
+
+
+class TraceLog:
+    def __init__(self, path: Optional[Path] = None, keep: int = 50):
+        self.__path = path
+        self.__lock = threading.Lock()
+        self.__recent = deque(maxlen=keep)
+
+    def record(self, method: str, url: str, status: Union[int, str], seconds: float, sent: int = 0,
+               received: int = 0) -> Trace:
+        trace = Trace(time.time(), method, url, status, seconds, sent, received)
+        with self.__lock:
+            self.__recent.append(trace)
+            if self.__path is not None:
+                with open(self.__path, 'a', encoding='utf-8') as file:
+                    file.write(json.dumps(asdict(trace)) + '\n')
+        return trace
+
+    def recent(self) -> List[Trace]:
+        with self.__lock:
+            return list(self.__recent)
+
+
+class TimedIterator:
+    def __init__(self, iterable: Iterable):
+        self.__iterator = iter(iterable)
+        self.elapsed = 0.0
+
+    def __iter__(self) -> 'TimedIterator':
+        return self
+
+    def __next__(self) -> Any:
+        start = time.perf_counter()
+        try:
+            return next(self.__iterator)
+        finally:
+            self.elapsed += time.perf_counter() - start
+
+
+_DISABLED = nullcontext()
+
+
+class Instruments:
+    def __init__(self, *sinks: Sink):
+        self.__sinks: List[Sink] = list(sinks)
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.__sinks)
+
+    @property
+    def sinks(self) -> List[Sink]:
+        return list(self.__sinks)
+
+    def count(self, name: str, value: float = 1) -> None:
+        for sink in self.__sinks:
+            sink.record(COUNTER, name, value)
+
+    def observe(self, name: str, seconds: float) -> None:
+        for sink in self.__sinks:
+            sink.record(TIMER, name, seconds)
+
+    @contextmanager
+    def __timer(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start)
+
+    def timer(self, name: str) -> ContextManager[None]:
+        return self.__timer(name) if self.__sinks else _DISABLED
+
+
+DISABLED = Instruments()
@@ -0,0 +1,32 @@
+import sys
+import threading
+from typing import Any, List, Optional, TextIO
+
+
+class Output:
+    def __init__(self, stream: Optional[TextIO] = None):
+        self.__stream = stream
+        self.__buffer: List[str] = []
+        self.__lock = threading.Lock()
+
+    @property
+    def stream(self) -> TextIO:
+        return self.__stream if self.__stream is not None else sys.stdout
+
+    def print(self, *values: Any, sep: str = ' ', end: str = '\n') -> None:
+        text = sep.join(map(str, values)) + end
+        with self.__lock:
+            self.__buffer.append(text)
+
+    def flush(self) -> None:
+        with self.__lock:
+            text = ''.join(self.__buffer)
+            self.__buffer.clear()
+        if text:
+            stream = self.stream
+            stream.write(text)
+            stream.flush()
+
+    def read(self, prompt: str = '') -> str:
+        self.flush()
+        return input(prompt)
@@ -0,0 +1,25 @@
+from typing import Any, Callable, Sequence, Tuple
+
+from valid8 import ValidationError
+
+from event.domain import Name, Description, Author, Date, Location, Category, Priority, Event
+from validation.levels import boundary
+
+READ_ERRORS = (TypeError, ValueError, ValidationError)
+EVENT_PROMPTS: Tuple[Tuple[str, Callable], ...] = (('Name', Name), ('Description', Description),
+                                                   ('Start date', Date.from_input), ('End date', Date.from_input),
+                                                   ('Location', Location), ('Category', Category),
+                                                   ('Priority', Priority))
+
+
+def parse_value(prompt: str, line: str, builder: Callable) -> Any:
+    with boundary():
+        if prompt == 'Category' or prompt == 'Priority':
+            return builder(int(line))
+        return builder(line.strip())
+
+
+def input_event(author_id: int, values: Sequence[Any]) -> Event:
+    name, description, start_date, end_date, location, category, priority = values
+    with boundary():
+        return Event(-1, name, description, Author(author_id), start_date, end_date, location, category, priority)
@@ -0,0 +1,130 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from itertools import islice
+from typing import Iterable, Iterator, List, TextIO, Tuple, Union
+
+from valid8 import validate, ValidationError
+
+from event.api import ApiClient, event_payload
+from event.dates import parse_iso, parse_server
+from event.domain import Name, Description, Author, Date, Location, Category, Priority, Event, date_context
+from validation.levels import boundary
+
+TSV_HEADER = 'name\t description\t start_date\t end_date\t location\t category\t priority'
+
+ParsedRow = Tuple[int, Union[Event, Exception]]
+
+
+@dataclass(frozen=True)
+class RowError:
+    line: int
+    message: str
+
+
+@dataclass
+class ImportReport:
+    imported: int = 0
+    failed: int = 0
+    errors: List[RowError] = field(default_factory=list)
+
+    def add_error(self, line: int, message: str, max_errors: int) -> None:
+        self.failed += 1
+        if len(self.errors) < max_errors:
+            self.errors.append(RowError(line, message))
+
+
+def export_tsv(events: Iterable[Event], file: TextIO) -> int:
+    file.write(TSV_HEADER + '\n')
+    res = 0
+    for event in events:
+        file.write(str(event).split('\n', 1)[1])
+        res += 1
+    return res
+
+
+def export_jsonl(events: Iterable[Event], file: TextIO) -> int:
+    res = 0
+    for event in events:
+        file.write(json.dumps(event.to_row()) + '\n')
+        res += 1
+    return res
+
+
+def _event(author: int, name: str, description: str, start_date: datetime, end_date: datetime, location: str,
+           category: int, priority: int) -> Event:
+    with boundary():
+        return Event(-1, Name(name), Description(description), Author(author), Date(start_date), Date(end_date),
+                     Location(location), Category(category), Priority(priority))
+
+
+def read_tsv(file: TextIO, author: int) -> Iterator[ParsedRow]:
+    for number, line in enumerate(file, start=1):
+        line = line.rstrip('\n')
+        if not line or (number == 1 and line == TSV_HEADER):
+            continue
+        try:
+            values = line.split('\t')
+            validate('columns', len(values), equals=7)
+            name, description, start_date, end_date, location, category, priority = values
+            yield number, _event(author, name, description, parse_iso(start_date), parse_iso(end_date), location,
+                                 int(category), int(priority))
+        except (TypeError, ValueError, ValidationError) as e:
+            yield number, e
+
+
+def read_jsonl(file: TextIO, author: int) -> Iterator[ParsedRow]:
+    for number, line in enumerate(file, start=1):
+        if not line.strip():
+            continue
+        try:
+            item = json.loads(line)
+            yield number, _event(author, item['name'], item['description'], parse_server(item['start_date']),
+                                 parse_server(item['end_date']), item['location'], item['category'], item['priority'])
+        except (KeyError, TypeError, ValueError, ValidationError) as e:
+            yield number, e
+
+
+class Importer:
+    def __init__(self, api: ApiClient, chunk_size: int = 500, workers: int = 4, max_errors: int = 1000):
+        validate('chunk_size', chunk_size, min_value=1)
+        validate('workers', workers, min_value=1)
+        self.__api = api
+        self.__chunk_size = chunk_size
+        self.__workers = workers
+        self.__max_errors = max_errors
+
+    def __upload(self, event: Event) -> Union[bool, str]:
+        try:
+            res = self.__api.create_event(event_payload(event))
+        except OSError as e:
+            return str(e)
+        return True if res.status_code in (200, 201) else f'Server answered {res.status_code}'
+
+    def run(self, rows: Iterable[ParsedRow]) -> ImportReport:
+        report = ImportReport()
+        rows = iter(rows)
+        with ThreadPoolExecutor(max_workers=self.__workers) as executor:
+            while True:
+                with date_context():
+                    chunk = list(islice(rows, self.__chunk_size))
+                if not chunk:
+                    return report
+                valid = []
+                for number, parsed in chunk:
+                    if isinstance(parsed, Event):
+                        valid.append((number, parsed))
+                    else:
+                        report.add_error(number, str(parsed), self.__max_errors)
+                for (number, _), outcome in zip(valid, executor.map(self.__upload, [e for _, e in valid])):
+                    if outcome is True:
+                        report.imported += 1
+                    else:
+                        report.add_error(number, outcome, self.__max_errors)
+
+    def import_tsv(self, file: TextIO, author: int) -> ImportReport:
+        return self.run(read_tsv(file, author))
+
+    def import_jsonl(self, file: TextIO, author: int) -> ImportReport:
+        return self.run(read_jsonl(file, author))
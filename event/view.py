@@ -0,0 +1,71 @@
+from collections import OrderedDict
+from typing import List, Tuple
+
+from valid8 import validate
+
+from event.domain import Event, ToDoList
+
+INDEX_FORMAT = '%5s '
+ROW_FORMAT = '%20s %30s %5s %20s %20s %20s %10s %10s'
+HEADER = INDEX_FORMAT % '#' + ROW_FORMAT % ('NAME', 'DESCRIPTION', 'AUTHOR', 'START DATE', 'END DATE', 'LOCATION',
+                                            'CATEGORY', 'PRIORITY')
+SEPARATOR = '-' * 150
+
+
+class ListView:
+    def __init__(self, page_size: int = 20, max_cached: int = 1000):
+        validate('page_size', page_size, min_value=1)
+        validate('max_cached', max_cached, min_value=page_size)
+        self.__page_size = page_size
+        self.__max_cached = max_cached
+        self.__page = 0
+        self.__rows: 'OrderedDict[int, Tuple[Event, str]]' = OrderedDict()
+
+    @property
+    def page(self) -> int:
+        return self.__page
+
+    @property
+    def page_size(self) -> int:
+        return self.__page_size
+
+    def pages(self, toDoList: ToDoList) -> int:
+        return max(1, -(-toDoList.events() // self.__page_size))
+
+    def next(self, toDoList: ToDoList) -> int:
+        return self.jump(toDoList, self.__page + 1)
+
+    def prev(self, toDoList: ToDoList) -> int:
+        return self.jump(toDoList, self.__page - 1)
+
+    def jump(self, toDoList: ToDoList, page: int) -> int:
+        self.__page = min(max(page, 0), self.pages(toDoList) - 1)
+        return self.__page
+
+    def __row(self, event: Event) -> str:
+        cached = self.__rows.get(event.id)
+        if cached is not None and cached[0] == event:
+            self.__rows.move_to_end(event.id)
+            return cached[1]
+        row = ROW_FORMAT % (event.name.value, event.description.value, event.author.key, event.start_date.date,
+                            event.end_date.date, event.location.value, event.category.value, event.priority.value)
+        self.__rows[event.id] = event, row
+        self.__rows.move_to_end(event.id)
+        if len(self.__rows) > self.__max_cached:
+            self.__rows.popitem(last=False)
+        return row
+
+    def rows(self, toDoList: ToDoList) -> List[str]:
+        self.jump(toDoList, self.__page)
+        start = self.__page * self.__page_size
+        end = min(start + self.__page_size, toDoList.events())
+        return [INDEX_FORMAT % (index + 1) + self.__row(toDoList.event(index)) for index in range(start, end)]
+
+    def render(self, toDoList: ToDoList) -> str:
+        rows = self.rows(toDoList)
+        footer = f'Page {self.__page + 1}/{self.pages(toDoList)} ({toDoList.events()} events)'
+        return '\n'.join([SEPARATOR, HEADER, SEPARATOR] + rows + [SEPARATOR, footer])
+
+    def clear(self) -> None:
+        self.__page = 0
+        self.__rows.clear()
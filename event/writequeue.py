@@ -0,0 +1,139 @@
+import dataclasses
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from itertools import count
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from valid8 import validate
+
+from event.api import ApiClient, event_payload
+from event.domain import Event, ToDoList
+
+CREATE = 'create'
+DELETE = 'delete'
+
+
+@dataclass(frozen=True)
+class PendingWrite:
+    kind: str
+    event: Event
+
+
+class WriteQueue:
+    def __init__(self, api: ApiClient, toDoList: Callable[[], ToDoList], batch_size: int = 20,
+                 flush_interval: Optional[float] = 1.0, workers: int = 4,
+                 on_failure: Callable[[PendingWrite], None] = lambda write: None,
+                 on_resync: Callable[[], None] = lambda: None, lock: Optional[threading.RLock] = None):
+        validate('batch_size', batch_size, min_value=1)
+        validate('workers', workers, min_value=1)
+        self.__api = api
+        self.__toDoList = toDoList
+        self.__batch_size = batch_size
+        self.__flush_interval = flush_interval
+        self.__workers = workers
+        self.__on_failure = on_failure
+        self.__on_resync = on_resync
+        self.__pending: Dict[int, PendingWrite] = {}
+        self.__in_flight: Dict[int, PendingWrite] = {}
+        self.__cancelled: Set[int] = set()
+        self.__next_temporary_id = count(-1, -1)
+        self.__lock = lock if lock is not None else threading.RLock()
+        self.__timer: Optional[threading.Timer] = None
+
+    def pending(self) -> int:
+        with self.__lock:
+            return len(self.__pending)
+
+    def create(self, event: Event) -> Event:
+        with self.__lock:
+            event = dataclasses.replace(event, id=next(self.__next_temporary_id))
+            self.__toDoList().add_event(event)
+            self.__pending[event.id] = PendingWrite(CREATE, event)
+        self.__schedule()
+        return event
+
+    def delete(self, event: Event) -> None:
+        with self.__lock:
+            toDoList = self.__toDoList()
+            if toDoList.contains(event.id):
+                toDoList.remove_by_id(event.id)
+            pending = self.__pending.get(event.id)
+            if pending is not None and pending.kind == CREATE:
+                del self.__pending[event.id]
+            elif event.id in self.__in_flight:
+                self.__cancelled.add(event.id)
+            elif pending is None and event.id >= 0:
+                self.__pending[event.id] = PendingWrite(DELETE, event)
+        self.__schedule()
+
+    def __schedule(self) -> None:
+        with self.__lock:
+            if len(self.__pending) < self.__batch_size:
+                if self.__flush_interval is not None and self.__timer is None and self.__pending:
+                    self.__timer = threading.Timer(self.__flush_interval, self.flush)
+                    self.__timer.daemon = True
+                    self.__timer.start()
+                return
+        self.flush()
+
+    def __send(self, write: PendingWrite) -> Tuple[bool, Any]:
+        try:
+            if write.kind == CREATE:
+                res = self.__api.create_event(event_payload(write.event))
+                ok = res.status_code in (200, 201)
+                return ok, res.json() if ok else None
+            res = self.__api.delete_event(write.event.id)
+            return res.status_code in (200, 204), None
+        except (OSError, ValueError):
+            return False, None
+
+    def __apply(self, write: PendingWrite, ok: bool, body: Any) -> bool:
+        toDoList = self.__toDoList()
+        if write.kind == CREATE:
+            del self.__in_flight[write.event.id]
+            cancelled = write.event.id in self.__cancelled
+            self.__cancelled.discard(write.event.id)
+            if toDoList.contains(write.event.id):
+                toDoList.remove_by_id(write.event.id)
+            if ok and not (isinstance(body, dict) and 'id' in body):
+                return True
+            if ok and cancelled:
+                event = Event.from_trusted_dict(body)
+                self.__pending[event.id] = PendingWrite(DELETE, event)
+            elif ok:
+                toDoList.upsert_event(Event.from_trusted_dict(body))
+        elif not ok:
+            toDoList.upsert_event(write.event)
+        return False
+
+    def flush(self) -> List[PendingWrite]:
+        with self.__lock:
+            batch = list(self.__pending.values())
+            self.__pending.clear()
+            self.__in_flight.update((write.event.id, write) for write in batch if write.kind == CREATE)
+            if self.__timer is not None:
+                self.__timer.cancel()
+                self.__timer = None
+        if not batch:
+            return []
+        with ThreadPoolExecutor(max_workers=min(self.__workers, len(batch))) as executor:
+            results = list(executor.map(self.__send, batch))
+        failures = []
+        resync = False
+        with self.__lock:
+            for write, (ok, body) in zip(batch, results):
+                resync = self.__apply(write, ok, body) or resync
+                if not ok:
+                    failures.append(write)
+            cancelled = any(write.kind == DELETE for write in self.__pending.values())
+        for write in failures:
+            self.__on_failure(write)
+        if resync:
+            self.__on_resync()
+        if cancelled:
+            failures.extend(self.flush())
+        return failures
+
+    def close(self) -> List[PendingWrite]:
+        return self.flush()
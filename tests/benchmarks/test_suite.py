@@ -0,0 +1,39 @@
+import json
+
+from benchmarks.suite import CASES, Benchmark, compare, main, run
+
+
+def test_benchmark_records_timings():
+    benchmark = Benchmark(rounds=3, warmup=1)
+    calls = []
+    res = benchmark('noop', 1, lambda state: calls.append(state), setup=lambda: 'state')
+    assert calls == ['state'] * 4
+    assert (res.name, res.size, res.rounds) == ('noop', 1, 3)
+    assert res.min <= res.mean <= res.max
+
+
+def test_run_every_case_on_a_small_size():
+    report = run(sizes=[10], rounds=1)
+    names = [res['name'] for res in report['results']]
+    assert all(any(name.startswith(case) for name in names) for case in CASES)
+    assert all(res['size'] in (0, 10) for res in report['results'])
+    assert {res['unit'] for res in report['results']} == {'seconds', 'bytes'}
+
+
+def test_compare_reports_regressions():
+    baseline = {'results': [{'name': 'a', 'size': 10, 'min': 1.0}, {'name': 'b', 'size': 10, 'min': 1.0}]}
+    report = {'results': [{'name': 'a', 'size': 10, 'min': 1.1}, {'name': 'b', 'size': 10, 'min': 2.0},
+                          {'name': 'c', 'size': 10, 'min': 5.0}]}
+    assert [res['name'] for res in compare(baseline, report)] == ['b']
+
+
+def test_main_saves_json_and_compares(tmp_path, capsys):
+    output = tmp_path / 'new.json'
+    assert main(['--sizes', '10', '--rounds', '1', '--only', 'todolist_sort', '--output', str(output)]) == 0
+    report = json.loads(output.read_text(encoding='utf-8'))
+    assert report['results'][0]['name'] == 'todolist_sort'
+    baseline = tmp_path / 'baseline.json'
+    baseline.write_text(json.dumps({'results': [dict(report['results'][0], min=report['results'][0]['min'] / 100)]}))
+    assert main(['--sizes', '10', '--rounds', '1', '--only', 'todolist_sort', '--output', str(output),
+                 '--compare', str(baseline)]) == 1
+    assert 'REGRESSION todolist_sort' in capsys.readouterr().out
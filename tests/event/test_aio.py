@@ -0,0 +1,235 @@
+import asyncio
+from datetime import datetime
+from io import StringIO
+
+from event.aio import AsyncApp, ThreadedTransport
+from event.api import ApiClient, ApiConfig
+from event.domain import Name, Description, Author, Date, Location, Category, Priority, Event
+from event.output import Output
+from validation.levels import validation_level, BOUNDARY
+from benchmarks.fake_api import FakeApi, make_events
+
+
+class FakeTransport:
+    def __init__(self, events, delay=0.0):
+        self.events_list = list(events)
+        self.delay = delay
+        self.calls = []
+        self.key = None
+
+    def authenticate(self, key):
+        self.key = key
+
+    def forget(self):
+        self.key = None
+
+    async def __reply(self, name, status, body=None):
+        self.calls.append(name)
+        await asyncio.sleep(self.delay)
+        return status, body
+
+    async def login(self, username, password):
+        return await self.__reply('login', 200 if password == 'secret' else 400, {'key': 'k'})
+
+    async def author(self, username):
+        return await self.__reply('author', 200, {'id': 1})
+
+    async def events(self):
+        return await self.__reply('events', 200 if self.key else 401, list(self.events_list))
+
+    async def create_event(self, obj):
+        item = dict(obj, id=100, start_date='2099-01-01T10:00:00Z', end_date='2099-01-02T10:00:00Z',
+                    category=int(obj['category']), priority=int(obj['priority']))
+        self.events_list.append(item)
+        return await self.__reply('create', 201, item)
+
+    async def delete_event(self, id):
+        self.events_list = [item for item in self.events_list if item['id'] != id]
+        return await self.__reply('delete', 204)
+
+    async def logout(self):
+        return await self.__reply('logout', 200)
+
+
+def new_event():
+    return Event(-1, Name('nuovo'), Description('descr'), Author(1), Date(datetime(2099, 1, 1, 10)),
+                 Date(datetime(2099, 1, 2, 10)), Location('casa'), Category(1), Priority(2))
+
+
+def test_login_and_fetch():
+    async def scenario():
+        app = AsyncApp(FakeTransport(make_events(3)))
+        assert not await app.login('tiziana', 'wrong')
+        assert await app.login('tiziana', 'secret')
+        assert await app.fetch_events() == 3
+        return app
+    app = asyncio.run(scenario())
+    assert app.is_logged
+    assert app.toDoList.events() == 3
+
+
+def test_add_and_remove_run_as_tasks():
+    async def scenario():
+        transport = FakeTransport(make_events(2), delay=0.01)
+        app = AsyncApp(transport)
+        await app.login('tiziana', 'secret')
+        await app.fetch_events()
+        add = app.spawn(app.add_event(new_event()))
+        remove = app.spawn(app.remove_event(1))
+        await app.drain()
+        return app, add.result(), remove.result()
+    app, added, removed = asyncio.run(scenario())
+    assert added and removed
+    assert app.toDoList.contains(100)
+    assert not app.toDoList.contains(1)
+
+
+def test_background_refresh_keeps_sort_order():
+    async def scenario():
+        transport = FakeTransport(make_events(2))
+        app = AsyncApp(transport, refresh_interval=0.01)
+        await app.login('tiziana', 'secret')
+        await app.fetch_events()
+        app.sort_by('sort_by_priority')
+        app.start_refresh()
+        transport.events_list.extend(make_events(1, start_id=5))
+        await asyncio.sleep(0.05)
+        app.stop_refresh()
+        return app
+    app = asyncio.run(scenario())
+    assert app.toDoList.events() == 3
+    assert [event.priority.value for event in app.toDoList.by_priority()] == \
+           [app.toDoList.event(index).priority.value for index in range(3)]
+
+
+def test_logout_clears_events():
+    async def scenario():
+        app = AsyncApp(FakeTransport(make_events(2)))
+        await app.login('tiziana', 'secret')
+        await app.fetch_events()
+        assert await app.logout()
+        return app
+    app = asyncio.run(scenario())
+    assert not app.is_logged
+    assert app.toDoList.events() == 0
+
+
+def test_interactive_run():
+    lines = iter(['1', 'tiziana', 'secret', '1', 'nuovo', 'descr', '1/1/30T10:00:00Z', '1/2/30T10:00:00Z', 'casa', '1',
+                  '2', '0', '0'])
+
+    async def read(prompt):
+        return next(lines)
+
+    output = StringIO()
+    transport = FakeTransport(make_events(2))
+    asyncio.run(AsyncApp(transport, read=read, output=Output(output)).run())
+    for text in ('*** To Do List Login ***', 'Event added!', 'Logged out!', 'Bye!'):
+        assert text in output.getvalue()
+    assert transport.calls == ['login', 'author', 'events', 'create', 'logout']
+
+
+def test_threaded_transport_against_fake_api():
+    async def scenario(url):
+        app = AsyncApp(ThreadedTransport(ApiClient(ApiConfig(url))))
+        assert await app.login('tiziana', 'secret')
+        return await app.fetch_events()
+    with FakeApi(make_events(4)) as api:
+        assert asyncio.run(scenario(api.url)) == 4
+
+
+class BrokenTransport(FakeTransport):
+    async def create_event(self, obj):
+        raise ConnectionError('connection refused')
+
+
+def test_transport_errors_are_reported():
+    lines = iter(['1', 'tiziana', 'secret', '1', 'nuovo', 'descr', '1/1/30T10:00:00Z', '1/2/30T10:00:00Z', 'casa', '1',
+                  '2', '0', '0'])
+
+    async def read(prompt):
+        return next(lines)
+
+    output = StringIO()
+    asyncio.run(AsyncApp(BrokenTransport(make_events(2)), read=read, output=Output(output)).run())
+    assert 'Unable to add the event' in output.getvalue()
+    assert 'Event added!' not in output.getvalue()
+
+
+class FlakyTransport(FakeTransport):
+    def __init__(self, events):
+        super().__init__(events)
+        self.attempts = 0
+
+    async def events(self):
+        self.attempts += 1
+        if self.attempts == 2:
+            raise ConnectionError('connection reset')
+        return await super().events()
+
+
+def test_background_refresh_survives_transport_errors():
+    async def scenario():
+        transport = FlakyTransport(make_events(2))
+        app = AsyncApp(transport, refresh_interval=0.01)
+        await app.login('tiziana', 'secret')
+        app.start_refresh()
+        await asyncio.sleep(0.1)
+        app.stop_refresh()
+        return transport.attempts
+    assert asyncio.run(scenario()) > 2
+
+
+class UnreachableTransport(FakeTransport):
+    async def login(self, username, password):
+        raise ConnectionError('connection refused')
+
+
+class LogoutFailingTransport(FakeTransport):
+    async def logout(self):
+        raise ConnectionError('connection reset')
+
+
+def test_login_and_logout_errors_are_reported():
+    def run(transport, *inputs):
+        lines = iter(inputs)
+
+        async def read(prompt):
+            return next(lines)
+
+        output = StringIO()
+        asyncio.run(AsyncApp(transport, read=read, output=Output(output)).run())
+        return output.getvalue()
+
+    output = run(UnreachableTransport(make_events(2)), '1', 'tiziana', 'secret', '0')
+    assert 'connection refused' in output and 'Wrong Credentials!' in output
+    output = run(LogoutFailingTransport(make_events(2)), '1', 'tiziana', 'secret', '0', '0')
+    assert 'connection reset' in output and 'Log out failed' in output
+    assert output.rstrip().endswith('Bye!')
+
+
+def test_events_are_printed_one_page_at_a_time():
+    lines = iter(['1', 'tiziana', 'secret', '6', '0', '0'])
+
+    async def read(prompt):
+        return next(lines)
+
+    output = StringIO()
+    asyncio.run(AsyncApp(FakeTransport(make_events(25)), read=read, output=Output(output), page_size=10).run())
+    footers = [line for line in output.getvalue().splitlines() if line.startswith('Page ')]
+    assert footers[1:3] == ['Page 1/3 (25 events)', 'Page 2/3 (25 events)']
+
+
+def test_end_before_start_is_rejected_at_boundary_level():
+    lines = iter(['1', 'tiziana', 'secret', '1', 'nuovo', 'descr', '1/2/30T10:00:00Z', '1/1/30T10:00:00Z', 'casa', '1',
+                  '2', '0', '0'])
+
+    async def read(prompt):
+        return next(lines)
+
+    output = StringIO()
+    transport = FakeTransport(make_events(2))
+    with validation_level(BOUNDARY):
+        asyncio.run(AsyncApp(transport, read=read, output=Output(output)).run())
+    assert 'create' not in transport.calls
+    assert 'Event added!' not in output.getvalue()
@@ -0,0 +1,126 @@
+from unittest.mock import patch, Mock
+
+import pytest
+from requests import HTTPError
+from valid8 import ValidationError
+
+from event.api import ApiClient, ApiConfig
+from benchmarks.fake_api import FakeApi, make_events
+
+
+def test_config_must_have_positive_pool_size():
+    ApiConfig(pool_size=1)
+    with pytest.raises(ValidationError):
+        ApiConfig(pool_size=0)
+
+
+def test_config_must_have_positive_timeouts():
+    with pytest.raises(ValidationError):
+        ApiConfig(connect_timeout=0.0)
+    with pytest.raises(ValidationError):
+        ApiConfig(read_timeout=-1.0)
+
+
+def test_config_timeout():
+    assert ApiConfig(connect_timeout=1.0, read_timeout=2.0).timeout == (1.0, 2.0)
+
+
+def test_client_mounts_pooled_adapter():
+    client = ApiClient(ApiConfig(pool_size=4, retries=2))
+    adapter = client._ApiClient__session.get_adapter('http://localhost:8000')
+    assert adapter._pool_maxsize == 4
+    assert adapter.max_retries.total == 2
+
+
+def test_authenticate_attaches_token_once():
+    client = ApiClient()
+    assert not client.is_authenticated
+    client.authenticate('abc')
+    assert client.is_authenticated
+    client.forget()
+    assert not client.is_authenticated
+
+
+@patch('requests.Session.get', return_value=Mock(status_code=200))
+def test_requests_reuse_session_headers(mocked_get):
+    client = ApiClient(ApiConfig('http://example.com/api', connect_timeout=1.0, read_timeout=2.0))
+    client.authenticate('abc')
+    client.events()
+    client.events()
+    assert mocked_get.call_count == 2
+    mocked_get.assert_called_with(url='http://example.com/api/events', timeout=(1.0, 2.0))
+    assert client._ApiClient__session.headers['Authorization'] == 'Token abc'
+
+
+@patch('requests.Session.get', return_value=Mock(status_code=200))
+def test_streaming_events(mocked_get):
+    client = ApiClient(ApiConfig(stream=True, chunk_size=4))
+    res = client.events()
+    res.iter_content.return_value = iter([b'[{"id"', b': 1}, {"id": 2}]'])
+    assert list(client.event_items(res)) == [{'id': 1}, {'id': 2}]
+    res.iter_content.assert_called_with(chunk_size=4)
+    res.json.assert_not_called()
+    assert mocked_get.call_args.kwargs['stream']
+
+
+def test_event_items_parses_body_once():
+    res = Mock()
+    res.json.return_value = [{'id': 1}]
+    assert list(ApiClient().event_items(res)) == [{'id': 1}]
+    res.json.assert_called_once()
+
+
+def test_paged_events_are_fetched_concurrently_and_in_order():
+    with FakeApi(make_events(35), delay=0.05) as api:
+        client = ApiClient(ApiConfig(api.url, page_size=10, workers=3))
+        client.authenticate(api.key)
+        res = client.events()
+        assert res.status_code == 200
+        assert [item['id'] for item in client.event_items(res)] == list(range(1, 36))
+    assert api.requests.count('GET /events') == 4
+    assert api.max_active > 1
+
+
+def test_paged_events_single_page():
+    with FakeApi(make_events(5)) as api:
+        client = ApiClient(ApiConfig(api.url, page_size=10))
+        client.authenticate(api.key)
+        assert len(list(client.event_items(client.events()))) == 5
+    assert api.requests == ['GET /events']
+
+
+def test_paged_events_follow_a_server_side_limit():
+    with FakeApi(make_events(10), max_limit=2) as api:
+        client = ApiClient(ApiConfig(api.url, page_size=5))
+        client.authenticate(api.key)
+        assert [item['id'] for item in client.event_items(client.events())] == list(range(1, 11))
+
+
+def test_paged_events_refill_short_pages():
+    with FakeApi(make_events(10), max_limit=4) as api:
+        client = ApiClient(ApiConfig(api.url, page_size=4))
+        client.authenticate(api.key)
+        res = client.events()
+        api.max_limit = 3
+        assert [item['id'] for item in client.event_items(res)] == list(range(1, 11))
+
+
+def test_paged_events_failure_is_raised():
+    with FakeApi(make_events(15)) as api:
+        client = ApiClient(ApiConfig(api.url, page_size=10, retries=0))
+        client.authenticate(api.key)
+        res = client.events()
+        client.forget()
+        with pytest.raises(HTTPError):
+            list(client.event_items(res))
+
+
+@patch('requests.Session.get', return_value=Mock(status_code=200))
+def test_abandoned_stream_is_closed(mocked_get):
+    client = ApiClient(ApiConfig(stream=True, chunk_size=4))
+    res = client.events()
+    res.iter_content.return_value = iter([b'[{"id": 1}, {"id": 2}]'])
+    items = client.event_items(res)
+    assert next(items) == {'id': 1}
+    items.close()
+    res.close.assert_called_once()
@@ -0,0 +1,48 @@
+from event.cache import EventCache
+from benchmarks.fake_api import make_events
+
+
+def test_load_missing_file(tmp_path):
+    assert EventCache(tmp_path / 'cache.csv').load('tiziana') == []
+
+
+def test_save_and_load_roundtrip(tmp_path):
+    cache = EventCache(tmp_path / 'cache.csv')
+    events = make_events(3)
+    cache.save('tiziana', events)
+    assert cache.load('tiziana') == events
+
+
+def test_cache_is_keyed_by_user(tmp_path):
+    cache = EventCache(tmp_path / 'cache.csv')
+    cache.save('tiziana', make_events(2))
+    cache.save('mario', make_events(1, start_id=10))
+    cache.save('tiziana', make_events(1))
+    assert cache.load('tiziana') == make_events(1)
+    assert cache.load('mario') == make_events(1, start_id=10)
+
+
+def test_invalidate_removes_only_the_user(tmp_path):
+    cache = EventCache(tmp_path / 'cache.csv')
+    cache.save('tiziana', make_events(2))
+    cache.save('mario', make_events(1))
+    cache.invalidate('tiziana')
+    assert cache.load('tiziana') == []
+    assert cache.load('mario') == make_events(1)
+
+
+def test_outdated_version_is_ignored(tmp_path):
+    path = tmp_path / 'cache.csv'
+    EventCache(path).save('tiziana', make_events(2))
+    path.write_text(path.read_text().replace('v1', 'v0'))
+    assert EventCache(path).load('tiziana') == []
+
+
+def test_malformed_rows_are_skipped(tmp_path):
+    path = tmp_path / 'cache.csv'
+    cache = EventCache(path)
+    cache.save('tiziana', make_events(1))
+    with open(path, 'a') as file:
+        file.write('tiziana\tbroken\n')
+        file.write('tiziana\tx\ta\tb\t1\t2099-12-25T12:12:12Z\t2099-12-26T12:12:12Z\tc\t1\t1\n')
+    assert cache.load('tiziana') == make_events(1)
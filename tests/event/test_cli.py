@@ -0,0 +1,108 @@
+import json
+from io import StringIO
+from unittest.mock import patch
+
+import pytest
+
+from event.cache import EventCache
+from event.cli import main
+from benchmarks.fake_api import FakeApi, make_events
+
+
+def run(api, tmp_path, *argv, stdin=''):
+    stdout, stderr = StringIO(), StringIO()
+    code = main(['--url', api.url, '--username', 'tiziana', '--password', 'secret',
+                 '--cache', str(tmp_path / 'cache.csv'), *argv], StringIO(stdin), stdout, stderr)
+    return code, stdout.getvalue(), stderr.getvalue()
+
+
+def test_credentials_are_required(monkeypatch):
+    monkeypatch.delenv('TODOLIST_USERNAME', raising=False)
+    with pytest.raises(SystemExit):
+        main(['list'], StringIO(), StringIO(), StringIO())
+
+
+def test_unreachable_server(tmp_path):
+    stdout, stderr = StringIO(), StringIO()
+    code = main(['--url', 'http://127.0.0.1:9/api/v1', '--username', 'a', '--password', 'b', '--cache',
+                 str(tmp_path / 'cache.csv'), 'list'], StringIO(), stdout, stderr)
+    assert code == 1
+    assert stdout.getvalue() == ''
+    assert 'error' in json.loads(stderr.getvalue().splitlines()[-1])
+
+
+def test_list_emits_json_lines(tmp_path):
+    with FakeApi(make_events(3)) as api:
+        code, out, _ = run(api, tmp_path, 'list')
+    assert code == 0
+    assert [json.loads(line)['id'] for line in out.splitlines()] == [1, 2, 3]
+
+
+def test_sort_by_priority_as_tsv(tmp_path):
+    with FakeApi(make_events(3)) as api:
+        code, out, _ = run(api, tmp_path, 'sort', 'priority', '--format', 'tsv')
+    assert code == 0
+    lines = out.splitlines()
+    assert lines[0].startswith('name\t')
+    assert [line.split('\t')[0] for line in lines[1:]] == ['Evento 2', 'Evento 1', 'Evento 3']
+
+
+def test_add(tmp_path):
+    with FakeApi(make_events(1)) as api:
+        code, out, _ = run(api, tmp_path, 'add', '--name', 'nuovo', '--description', 'descr', '--start',
+                           '2099-01-01 10:00:00', '--end', '2099-01-02 10:00:00', '--location', 'casa',
+                           '--category', '1', '--priority', '2')
+    assert code == 0
+    assert json.loads(out) == dict(api.events[-1], id=2)
+    assert json.loads(out)['name'] == 'nuovo'
+
+
+def test_add_reports_validation_errors(tmp_path):
+    with FakeApi() as api:
+        code, out, err = run(api, tmp_path, 'add', '--name', 'nuovo', '--description', 'descr', '--start',
+                             '2099-01-01 10:00:00', '--end', '2099-01-02 10:00:00', '--location', 'casa',
+                             '--category', '9', '--priority', '2')
+    assert code == 1
+    assert out == ''
+    assert 'error' in json.loads(err.splitlines()[-1])
+    assert 'POST /' not in api.requests
+
+
+def test_remove(tmp_path):
+    with FakeApi(make_events(3)) as api:
+        code, out, _ = run(api, tmp_path, 'remove', '2', '7')
+    assert code == 1
+    assert [json.loads(line) for line in out.splitlines()] == [{'id': 2, 'removed': True},
+                                                              {'id': 7, 'removed': False}]
+    assert [e['id'] for e in api.events] == [1, 3]
+    assert 'GET /events' not in api.requests
+
+
+def test_export_then_import(tmp_path):
+    path = tmp_path / 'events.jsonl'
+    with FakeApi(make_events(3)) as api:
+        assert run(api, tmp_path, 'export', str(path))[:2] == (0, '{"exported": 3}\n')
+    with FakeApi() as api:
+        code, out, _ = run(api, tmp_path, 'import', '-', stdin=path.read_text(encoding='utf-8') + '{}\n')
+    assert code == 1
+    report = json.loads(out)
+    assert (report['imported'], report['failed'], report['errors'][0]['line']) == (3, 1, 4)
+    assert len(api.events) == 3
+
+
+def test_successful_run_writes_nothing_to_stderr(tmp_path):
+    with FakeApi(make_events(1)) as api:
+        code, _, err = run(api, tmp_path, 'list')
+    assert code == 0
+    assert err == ''
+
+
+def test_cache_is_kept_only_when_requested(tmp_path):
+    with FakeApi(make_events(2)) as api:
+        run(api, tmp_path, 'list')
+        with patch.object(EventCache, 'save') as save:
+            code = main(['--url', api.url, '--username', 'tiziana', '--password', 'secret', 'list'], StringIO(),
+                        StringIO(), StringIO())
+    assert code == 0
+    save.assert_not_called()
+    assert [row['id'] for row in EventCache(tmp_path / 'cache.csv').load('tiziana')] == [1, 2]
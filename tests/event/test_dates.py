@@ -0,0 +1,46 @@
+from datetime import datetime, timezone, timedelta
+
+import pytest
+
+from event.dates import parse_server, parse_input, parse_iso, format_server, clear_cache, SERVER_FORMAT
+from event.domain import Date
+
+
+def test_parse_server_matches_strptime():
+    for value in ('2099-12-25T12:12:12Z', '2000-02-29T00:00:00Z', '1999-01-01T23:59:59Z'):
+        assert parse_server(value) == datetime.strptime(value, SERVER_FORMAT)
+
+
+@pytest.mark.parametrize('value', ['2099-13-25T12:12:12Z', '2099-12-25 12:12:12', '2099-12-25T12:12:12', ''])
+def test_parse_server_rejects_bad_values(value):
+    with pytest.raises(ValueError):
+        parse_server(value)
+
+
+def test_parse_server_is_cached():
+    clear_cache()
+    parse_server('2099-12-25T12:12:12Z')
+    parse_server('2099-12-25T12:12:12Z')
+    assert parse_server.cache_info().hits == 1
+
+
+def test_parse_input():
+    assert parse_input('1/2/30T10:00:00Z') == datetime(2030, 1, 2, 10)
+    with pytest.raises(ValueError):
+        parse_input('2030-01-02')
+
+
+def test_parse_iso_normalizes_to_utc():
+    assert parse_iso('2099-01-01 10:00:00') == datetime(2099, 1, 1, 10)
+    assert parse_iso('2099-01-01T10:00:00+02:00') == datetime(2099, 1, 1, 8)
+
+
+def test_format_server_outputs_utc():
+    assert format_server(datetime(2099, 1, 1, 10)) == '2099-01-01T10:00:00Z'
+    assert format_server(datetime(2099, 1, 1, 10, tzinfo=timezone(timedelta(hours=2)))) == '2099-01-01T08:00:00Z'
+
+
+def test_date_codec():
+    date = Date(datetime(2099, 12, 25, 12, 12, 12))
+    assert date.to_server() == '2099-12-25T12:12:12Z'
+    assert Date.from_input('1/2/30T10:00:00Z') == Date(datetime(2030, 1, 2, 10))
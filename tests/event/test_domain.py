@@ -1,10 +1,12 @@
 from datetime import datetime
+from unittest.mock import patch
 
 import pytest
 from dataclass_type_validator import TypeValidationError
 from valid8 import ValidationError
 
-from event.domain import Name, Description, Author, Date, Priority, Category, Location, Event, ToDoList
+from event.domain import Name, Description, Author, Date, Priority, Category, Location, Event, ToDoList, EventRecord, \
+    date_context, USER_INPUT, SERVER_LOAD
 
 
 def test_name_format():
@@ -61,6 +63,41 @@ def test_wrong_date():
         Date(date)
 
 
+def test_date_server_load_accepts_past_dates():
+    with date_context(SERVER_LOAD):
+        assert Date(datetime(2010, 9, 9)).date == datetime(2010, 9, 9)
+    with pytest.raises(ValidationError):
+        Date(datetime(2010, 9, 9))
+
+
+def test_date_user_input_uses_one_reference_time():
+    with patch('event.domain.datetime', wraps=datetime) as mocked:
+        with date_context(USER_INPUT) as now:
+            Date(datetime(2099, 1, 1))
+            Date(datetime(2099, 1, 2))
+    assert isinstance(now, datetime)
+    mocked.now.assert_called_once()
+
+
+def test_date_user_input_reference_time():
+    with date_context(USER_INPUT, now=datetime(2000, 1, 1)):
+        Date(datetime(2010, 9, 9))
+        with pytest.raises(ValidationError):
+            Date(datetime(1999, 9, 9))
+
+
+def test_date_context_wrong_mode():
+    with pytest.raises(ValidationError):
+        with date_context('other'):
+            pass
+
+
+def test_server_rows_load_past_events():
+    row = {'id': 1, 'name': 'a', 'description': 'b', 'author': 1, 'start_date': '2010-01-01T10:00:00Z',
+           'end_date': '2010-01-02T10:00:00Z', 'location': 'c', 'category': 1, 'priority': 1}
+    assert Event.from_trusted_dict(row).start_date.date == datetime(2010, 1, 1, 10)
+
+
 def test_wrong_start_end_date():
     start_date = datetime(2021, 9, 9)
     end_date = datetime(2021, 8, 8)
@@ -155,4 +192,206 @@ def test_event_str():
                   Category(1), Priority(1))
     print(event)
 
-    assert str(event)=='name\t description\t start_date\t end_date\t location\t category\t priority\n'+ str(event.name) + '\t' + str(event.description) +'\t' + str(event.start_date) + '\t' + str(event.end_date) +'\t' + str(event.location) + '\t' + str(event.category) + '\t' + str(event.priority) + '\n'
\ No newline at end of file
+    assert str(event)=='name\t description\t start_date\t end_date\t location\t category\t priority\n'+ str(event.name) + '\t' + str(event.description) +'\t' + str(event.start_date) + '\t' + str(event.end_date) +'\t' + str(event.location) + '\t' + str(event.category) + '\t' + str(event.priority) + '\n'
+
+def test_upsert_event_replaces_by_id():
+    toDoList = ToDoList()
+    end_date = datetime(2030, 9, 9)
+    start_date = datetime(2030, 8, 8)
+    event = Event(1,Name('nome'), Description('descr'), Author(0), Date(start_date), Date(end_date), Location('casa mia'),
+                  Category(1), Priority(1))
+    toDoList.upsert_event(event)
+    updated = Event(1,Name('nuovo'), Description('descr'), Author(0), Date(start_date), Date(end_date), Location('casa mia'),
+                    Category(1), Priority(2))
+    toDoList.upsert_event(updated)
+    assert toDoList.events()==1
+    assert toDoList.event(0)==updated
+
+
+def test_from_rows_matches_per_field_construction():
+    item = {'id': 3, 'name': 'Calcetto', 'description': '11 vs 11', 'author': 1,
+            'start_date': '2030-12-25T12:12:12Z', 'end_date': '2030-12-26T12:12:12Z',
+            'location': 'stadio', 'category': 1, 'priority': 2}
+    expected = Event(3, Name('Calcetto'), Description('11 vs 11'), Author(1), Date(datetime(2030, 12, 25, 12, 12, 12)),
+                     Date(datetime(2030, 12, 26, 12, 12, 12)), Location('stadio'), Category(1), Priority(2))
+    assert Event.from_rows([item]) == [expected]
+    assert Event.from_trusted_dict(item) == expected
+    assert str(Event.from_trusted_dict(item)) == str(expected)
+
+
+def test_from_rows_rejects_invalid_rows():
+    item = {'id': 3, 'name': 'Calcetto', 'description': '11 vs 11', 'author': 1,
+            'start_date': '2030-12-25T12:12:12Z', 'end_date': '2030-12-26T12:12:12Z',
+            'location': 'stadio', 'category': 1, 'priority': 2}
+    with pytest.raises(ValidationError):
+        Event.from_rows([item, dict(item, name='a#b')])
+    with pytest.raises(ValidationError):
+        Event.from_rows([dict(item, category=8)])
+    with pytest.raises(ValidationError):
+        Event.from_rows([dict(item, end_date='2030-12-24T12:12:12Z')])
+    with pytest.raises(TypeError):
+        Event.from_rows([dict(item, priority='2')])
+
+
+def make_event(id, start_date, priority=1, end_date=datetime(2031, 1, 1)):
+    return Event(id, Name('nome'), Description('descr'), Author(0), Date(start_date), Date(end_date),
+                 Location('casa mia'), Category(1), Priority(priority))
+
+
+def test_sorted_views_keep_insertion_order():
+    toDoList = ToDoList()
+    first = make_event(1, datetime(2030, 8, 8), priority=0)
+    second = make_event(2, datetime(2030, 7, 7), priority=2)
+    third = make_event(3, datetime(2030, 9, 9), priority=1)
+    for event in [first, second, third]:
+        toDoList.add_event(event)
+    assert list(toDoList.by_start_date()) == [second, first, third]
+    assert list(toDoList.by_priority()) == [second, third, first]
+    assert list(toDoList.in_insertion_order()) == [first, second, third]
+
+
+def test_add_after_sort_keeps_view_sorted():
+    toDoList = ToDoList()
+    toDoList.add_event(make_event(1, datetime(2030, 8, 8)))
+    toDoList.sort_by_start_date()
+    earliest = make_event(2, datetime(2030, 7, 7))
+    toDoList.add_event(earliest)
+    assert toDoList.event(0) == earliest
+
+
+def test_remove_event_uses_current_view():
+    toDoList = ToDoList()
+    first = make_event(1, datetime(2030, 8, 8))
+    second = make_event(2, datetime(2030, 7, 7))
+    toDoList.add_event(first)
+    toDoList.add_event(second)
+    toDoList.sort_by_start_date()
+    toDoList.remove_event(0)
+    assert list(toDoList.in_insertion_order()) == [first]
+    assert list(toDoList.by_priority()) == [first]
+
+
+def test_upcoming_events():
+    toDoList = ToDoList()
+    events = [make_event(id, datetime(2030, month, 1)) for id, month in [(1, 5), (2, 1), (3, 3), (4, 9)]]
+    for event in events:
+        toDoList.add_event(event)
+    assert toDoList.upcoming(2, after=datetime(2030, 2, 1)) == [events[2], events[0]]
+    assert toDoList.upcoming(10, after=datetime(2030, 10, 1)) == []
+
+
+def test_lookup_by_id():
+    toDoList = ToDoList()
+    event = make_event(7, datetime(2030, 8, 8))
+    toDoList.add_event(event)
+    assert toDoList.contains(7)
+    assert not toDoList.contains(8)
+    assert toDoList.get_by_id(7) == event
+    with pytest.raises(ValidationError):
+        toDoList.get_by_id(8)
+
+
+def test_remove_by_id():
+    toDoList = ToDoList()
+    toDoList.add_event(make_event(7, datetime(2030, 8, 8)))
+    toDoList.remove_by_id(7)
+    assert toDoList.events() == 0
+    assert not toDoList.contains(7)
+    with pytest.raises(ValidationError):
+        toDoList.remove_by_id(7)
+
+
+def test_remove_many():
+    toDoList = ToDoList()
+    events = [make_event(id, datetime(2030, id, 1)) for id in range(1, 7)]
+    for event in events:
+        toDoList.add_event(event)
+    assert toDoList.remove_many([2, 4, 4, 99]) == 2
+    assert toDoList.events() == 4
+    assert list(toDoList.in_insertion_order()) == [events[0], events[2], events[4], events[5]]
+    assert list(toDoList.by_start_date()) == [events[0], events[2], events[4], events[5]]
+    assert toDoList.remove_many([]) == 0
+
+
+def test_compact_todolist_materializes_events():
+    toDoList = ToDoList(compact=True)
+    first = make_event(1, datetime(2030, 8, 8), priority=0)
+    second = make_event(2, datetime(2030, 7, 7, 10, 30, 15, 250), priority=2)
+    toDoList.add_event(first)
+    toDoList.add_event(second)
+    assert toDoList.event(1) == second
+    assert toDoList.get_by_id(1) == first
+    assert list(toDoList.by_start_date()) == [second, first]
+    assert list(toDoList.by_priority()) == [second, first]
+    toDoList.remove_by_id(2)
+    assert list(toDoList.in_insertion_order()) == [first]
+
+
+def test_compact_and_full_rows_agree():
+    rows = [{'id': id, 'name': 'Calcetto', 'description': '11 vs 11', 'author': 1,
+             'start_date': f'2030-12-{id:02}T12:12:12Z', 'end_date': '2030-12-26T12:12:12Z',
+             'location': 'stadio', 'category': 1, 'priority': id % 3} for id in range(1, 6)]
+    full = ToDoList()
+    compact = ToDoList(compact=True)
+    full.upsert_rows(rows)
+    compact.upsert_rows(rows)
+    assert list(full.by_priority()) == list(compact.by_priority())
+    assert full.upcoming(2, after=datetime(2030, 12, 2)) == compact.upcoming(2, after=datetime(2030, 12, 2))
+
+
+def test_event_record_uses_slots():
+    record = EventRecord.from_event(make_event(1, datetime(2030, 8, 8)))
+    assert not hasattr(record, '__dict__')
+    assert record.to_event() == make_event(1, datetime(2030, 8, 8))
+
+
+def make_query_list(compact=False):
+    toDoList = ToDoList(compact)
+    rows = [(1, 'stadio', 0, 0, 1, (2030, 1, 1), (2030, 1, 3)),
+            (2, 'casa mia', 1, 1, 1, (2030, 1, 2), (2030, 1, 10)),
+            (3, 'Stadio Olimpico', 2, 2, 2, (2030, 1, 5), (2030, 1, 6)),
+            (4, 'ufficio', 3, 1, 2, (2030, 2, 1), (2030, 2, 2))]
+    for id, location, category, priority, author, start_date, end_date in rows:
+        toDoList.add_event(Event(id, Name('nome'), Description('descr'), Author(author), Date(datetime(*start_date)),
+                                 Date(datetime(*end_date)), Location(location), Category(category),
+                                 Priority(priority)))
+    return toDoList
+
+
+def ids(events):
+    return [event.id for event in events]
+
+
+def test_query_without_filters_returns_all_by_start_date():
+    assert ids(make_query_list().query()) == [1, 2, 3, 4]
+
+
+def test_query_by_date_range_overlap():
+    toDoList = make_query_list()
+    assert ids(toDoList.query(start=datetime(2030, 1, 4), end=datetime(2030, 1, 5))) == [2, 3]
+    assert ids(toDoList.query(start=datetime(2030, 1, 7))) == [2, 4]
+    assert ids(toDoList.query(end=datetime(2030, 1, 2))) == [1, 2]
+    assert ids(toDoList.query(start=datetime(2030, 3, 1))) == []
+
+
+def test_query_by_values():
+    toDoList = make_query_list()
+    assert ids(toDoList.query(priority=1)) == [2, 4]
+    assert ids(toDoList.query(priority=1, author=2)) == [4]
+    assert ids(toDoList.query(category=2)) == [3]
+    assert ids(toDoList.query(category=3, priority=0)) == []
+
+
+def test_query_by_location_substring():
+    toDoList = make_query_list()
+    assert ids(toDoList.query(location='stadio')) == [1, 3]
+    assert ids(toDoList.query(location='stadio', end=datetime(2030, 1, 2))) == [1]
+
+
+def test_query_after_removal():
+    for compact in [False, True]:
+        toDoList = make_query_list(compact)
+        toDoList.remove_by_id(2)
+        toDoList.remove_many([4])
+        assert ids(toDoList.query(priority=1)) == []
+        assert ids(toDoList.query(start=datetime(2030, 1, 4), end=datetime(2030, 1, 5))) == [3]
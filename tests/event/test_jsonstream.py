@@ -0,0 +1,54 @@
+import pytest
+
+from event.jsonstream import iter_array
+
+
+def split(text, size):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+def test_iter_array_single_chunk():
+    assert list(iter_array(['[{"id": 1}, {"id": 2}]'])) == [{'id': 1}, {'id': 2}]
+
+
+def test_iter_array_empty():
+    assert list(iter_array([' [ ] '])) == []
+
+
+def test_iter_array_items_split_across_chunks():
+    text = '[{"id": 1, "name": "Calcetto"}, {"id": 2, "name": "Cena"}, 123, "x", true]'
+    for size in range(1, len(text)):
+        assert list(iter_array(split(text, size))) == [{'id': 1, 'name': 'Calcetto'}, {'id': 2, 'name': 'Cena'},
+                                                       123, 'x', True]
+
+
+def test_iter_array_decodes_utf8_bytes_split_inside_a_character():
+    text = '[{"name": "caffè"}]'.encode('utf-8')
+    assert list(iter_array(split(text, 1))) == [{'name': 'caffè'}]
+
+
+def test_iter_array_is_lazy():
+    items = iter_array(iter(['[{"id": 1},', ' {"id": 2}', ']']))
+    assert next(items) == {'id': 1}
+
+
+def test_iter_array_rejects_non_arrays():
+    with pytest.raises(ValueError):
+        list(iter_array(['{"id": 1}']))
+
+
+def test_iter_array_rejects_missing_separator():
+    with pytest.raises(ValueError):
+        list(iter_array(['[1 2]']))
+
+
+def test_iter_array_rejects_truncated_input():
+    with pytest.raises(ValueError):
+        list(iter_array(['[{"id": 1}, {"id"']))
+    with pytest.raises(ValueError):
+        list(iter_array([]))
+
+
+def test_iter_array_waits_for_numbers_split_across_chunks():
+    assert list(iter_array(['[1.', '5, 2]'])) == [1.5, 2]
+    assert list(iter_array(['[1e', '5, -', '3]'])) == [1e5, -3]
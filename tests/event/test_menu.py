@@ -1,9 +1,11 @@
+from io import StringIO
 from unittest.mock import Mock, patch, call
 
 import pytest
 from valid8 import ValidationError
 
 from event.menu import MenuDescription, Key, Entry, Menu
+from event.output import Output
 
 
 def test_description_must_be_string():
@@ -101,12 +103,27 @@ def test_menu_selection_call_on_selected(mocked_print, mocked_input):
 
 
 @patch('builtins.input', side_effect=['-1', '0'])
-@patch('builtins.print')
-def test_menu_selection_on_wrong_key(mocked_print, mocked_input):
-    menu = Menu.Builder(MenuDescription('a description')) \
+def test_menu_selection_on_wrong_key(mocked_input):
+    output = StringIO()
+    menu = Menu.Builder(MenuDescription('a description'), output=Output(output)) \
         .with_entry(Entry.create('1', 'first entry', on_selected=lambda: print('first entry selected'))) \
         .with_entry(Entry.create('0', 'exit', is_exit=True)) \
         .build()
     menu.run()
-    mocked_print.assert_any_call('Invalid selection. Please, try again...')
-    mocked_input.assert_called()
\ No newline at end of file
+    assert 'Invalid selection. Please, try again...' in output.getvalue()
+    mocked_input.assert_called()
+
+
+@patch('builtins.input', side_effect=['1', '0'])
+def test_menu_static_part_is_rendered_once(mocked_input):
+    output = Mock(spec=Output, wraps=Output(StringIO()))
+    menu = Menu.Builder(MenuDescription('a description'), auto_select=lambda: output.print('dynamic'),
+                        output=output) \
+        .with_entry(Entry.create('1', 'first entry')) \
+        .with_entry(Entry.create('0', 'exit', is_exit=True)) \
+        .build()
+    with patch.object(MenuDescription, '__str__', side_effect=AssertionError('rendered again')):
+        menu.run()
+    border = '*' * 21
+    assert output.mock_calls[:4] == [call.print(f'{border}\n*** a description ***\n{border}'), call.print('dynamic'),
+                                     call.print('1:\tfirst entry\n0:\texit'), call.flush()]
@@ -0,0 +1,188 @@
+from io import StringIO
+from unittest.mock import patch
+
+from event.api import ApiClient, ApiConfig
+from event.app import App
+from event.cache import EventCache
+from event.domain import ToDoList
+from event.metrics import Instruments, MemorySink, LogSink, PrometheusSink, TraceLog, DISABLED, COUNTER, TIMER, summary
+from event.output import Output
+from benchmarks.fake_api import FakeApi, make_events
+
+
+def test_memory_sink_aggregates_counters_and_timers():
+    sink = MemorySink()
+    instruments = Instruments(sink)
+    instruments.count('calls')
+    instruments.count('calls', 2)
+    instruments.observe('request', 0.5)
+    instruments.observe('request', 0.25)
+    assert sink.counters() == {'calls': 3}
+    stats = sink.timers()['request']
+    assert (stats.count, stats.total, stats.min, stats.max) == (2, 0.75, 0.25, 0.5)
+    sink.clear()
+    assert sink.counters() == {} and sink.timers() == {}
+
+
+def test_timer_records_elapsed_time_even_on_error():
+    sink = MemorySink()
+    try:
+        with Instruments(sink).timer('failing'):
+            raise ValueError()
+    except ValueError:
+        pass
+    assert sink.timers()['failing'].count == 1
+
+
+def test_log_sink_appends_one_line_per_record(tmp_path):
+    path = tmp_path / 'metrics.log'
+    with LogSink(path) as sink:
+        instruments = Instruments(sink)
+        instruments.count('calls')
+        instruments.observe('request', 0.5)
+        assert path.read_text(encoding='utf-8') == ''
+        sink.flush()
+        assert len(path.read_text(encoding='utf-8').splitlines()) == 2
+        instruments.count('calls')
+    lines = [line.split('\t') for line in path.read_text(encoding='utf-8').splitlines()]
+    assert [line[1:] for line in lines] == [[COUNTER, 'calls', '1'], [TIMER, 'request', '0.5'], [COUNTER, 'calls', '1']]
+
+
+def test_prometheus_sink_renders_text_format(tmp_path):
+    sink = PrometheusSink()
+    instruments = Instruments(sink)
+    instruments.count('api.events.calls')
+    instruments.observe('fetch.total', 0.5)
+    lines = sink.render().splitlines()
+    assert lines[:3] == ['# TYPE todolist_api_events_calls_total counter', 'todolist_api_events_calls_total 1',
+                         '# TYPE todolist_fetch_total_seconds histogram']
+    assert 'todolist_fetch_total_seconds_bucket{le="0.25"} 0' in lines
+    assert 'todolist_fetch_total_seconds_bucket{le="0.5"} 1' in lines
+    assert lines[-3:] == ['todolist_fetch_total_seconds_bucket{le="+Inf"} 1', 'todolist_fetch_total_seconds_sum 0.5',
+                          'todolist_fetch_total_seconds_count 1']
+    sink.dump(tmp_path / 'metrics.prom')
+    assert (tmp_path / 'metrics.prom').read_text(encoding='utf-8') == sink.render()
+
+
+def test_disabled_instruments_share_a_no_op_timer():
+    assert not DISABLED.enabled
+    assert DISABLED.timer('a') is DISABLED.timer('b')
+    DISABLED.count('calls')
+    assert Instruments(MemorySink()).enabled
+
+
+def test_todolist_reports_constructed_rows():
+    sink = MemorySink()
+    toDoList = ToDoList(instruments=Instruments(sink))
+    toDoList.upsert_rows(make_events(3))
+    assert toDoList.remove_many([1, 2]) == 2
+    toDoList.sort_by_priority()
+    assert sink.counters() == {'domain.rows': 3, 'domain.sort.priority': 1}
+    assert set(sink.timers()) == {'domain.upsert_rows', 'domain.remove_many'}
+
+
+def test_app_reports_api_calls_fetch_phases_and_rendering(tmp_path):
+    sink = MemorySink()
+    with FakeApi(make_events(3)) as api:
+        with patch('builtins.input', side_effect=['1', 'tiziana', 'secret', '5', '0', '0']):
+            App(ApiClient(ApiConfig(api.url)), cache=EventCache(tmp_path / 'cache.csv'), output=Output(StringIO()),
+                instruments=Instruments(sink)).run()
+    timers = sink.timers()
+    assert {'fetch.request', 'fetch.merge', 'fetch.total', 'domain.upsert_rows',
+            'render.print_events'} <= set(timers)
+    assert sink.counters()['domain.rows'] == 3
+
+
+def test_app_shares_api_client_instruments():
+    instruments = Instruments(MemorySink())
+    app = App(ApiClient(ApiConfig(), instruments), output=Output(StringIO()))
+    assert app.instruments is instruments
+    assert app.toDoList.instruments is instruments
+
+
+def test_timer_stats_estimate_quantiles_from_buckets():
+    sink = MemorySink()
+    instruments = Instruments(sink)
+    for seconds in (0.001, 0.002, 0.003, 0.004, 0.2):
+        instruments.observe('request', seconds)
+    stats = sink.timers()['request']
+    assert stats.quantile(0.5) == 0.005
+    assert stats.quantile(0.95) == 0.2
+    assert 'request' in summary(sink)
+
+
+def test_trace_log_keeps_recent_requests_and_appends_to_file(tmp_path):
+    path = tmp_path / 'trace.jsonl'
+    trace = TraceLog(path, keep=2)
+    for status in (200, 404, 500):
+        trace.record('GET', 'http://example.com/events', status, 0.01)
+    assert [entry.status for entry in trace.recent()] == [404, 500]
+    assert len(path.read_text(encoding='utf-8').splitlines()) == 3
+    assert '500' in str(trace.recent()[-1])
+
+
+def test_api_client_reports_latency_status_and_payload_sizes():
+    sink, trace = MemorySink(), TraceLog()
+    with FakeApi(make_events(3)) as api:
+        client = ApiClient(ApiConfig(api.url), Instruments(sink), trace)
+        client.login('tiziana', 'secret')
+        client.events()
+        client.authenticate(api.key)
+        client.events()
+        client.delete_event(1)
+    counters = sink.counters()
+    assert counters['api.events.calls'] == 2
+    assert counters['api.events.status.401'] == 1
+    assert counters['api.events.status.200'] == 1
+    assert counters['api.events.errors'] == 1
+    assert counters['api.delete_event.status.204'] == 1
+    assert counters['api.login.bytes_sent'] > 0
+    assert counters['api.events.bytes_received'] > 0
+    assert sink.timers()['api.events'].count == 2
+    assert [(entry.method, entry.status) for entry in trace.recent()] == [('POST', 200), ('GET', 401), ('GET', 200),
+                                                                         ('DELETE', 204)]
+
+
+def test_api_client_reports_connection_errors():
+    sink, trace = MemorySink(), TraceLog()
+    client = ApiClient(ApiConfig('http://127.0.0.1:1/api', retries=0), Instruments(sink), trace)
+    try:
+        client.logout()
+    except OSError:
+        pass
+    assert sink.counters()['api.logout.status.error'] == 1
+    assert sink.counters()['api.logout.errors'] == 1
+    assert trace.recent()[0].status == 'error'
+
+
+def test_stats_menu_entry_prints_endpoint_latencies(tmp_path):
+    output = StringIO()
+    with FakeApi(make_events(3)) as api:
+        client = ApiClient(ApiConfig(api.url), Instruments(MemorySink()), TraceLog())
+        with patch('builtins.input', side_effect=['1', 'tiziana', 'secret', '9', '0', '0']):
+            App(client, cache=EventCache(tmp_path / 'cache.csv'), output=Output(output)).run()
+    assert 'api.author' in output.getvalue()
+    assert 'api.events.status.200' in output.getvalue()
+    assert f'GET    {api.url}/events' in output.getvalue()
+
+
+def test_stats_are_disabled_without_sinks(tmp_path):
+    output = StringIO()
+    with FakeApi(make_events(1)) as api:
+        with patch('builtins.input', side_effect=['1', 'tiziana', 'secret', '9', '0', '0']):
+            App(ApiClient(ApiConfig(api.url)), cache=EventCache(tmp_path / 'cache.csv'), output=Output(output)).run()
+    assert 'Statistics are disabled' in output.getvalue()
+
+
+def test_fetch_separates_network_decoding_and_validation():
+    for stream in (False, True):
+        sink = MemorySink()
+        with FakeApi(make_events(3)) as api:
+            client = ApiClient(ApiConfig(api.url, stream=stream), Instruments(sink))
+            client.authenticate(api.key)
+            toDoList = ToDoList(instruments=client.instruments)
+            toDoList.upsert_rows(client.event_items(client.events()))
+        timers = sink.timers()
+        assert {'api.events', 'api.events.decode', 'domain.upsert_rows'} <= set(timers)
+        assert ('api.events.read' in timers) == stream
+        assert timers['api.events.decode'].count == 1
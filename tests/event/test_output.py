@@ -0,0 +1,32 @@
+from io import StringIO
+from unittest.mock import patch
+
+from event.output import Output
+
+
+def test_output_is_buffered_until_flush():
+    stream = StringIO()
+    output = Output(stream)
+    output.print('a', 1, sep='-')
+    output.print('b', end='')
+    assert stream.getvalue() == ''
+    output.flush()
+    assert stream.getvalue() == 'a-1\nb'
+    output.flush()
+    assert stream.getvalue() == 'a-1\nb'
+
+
+def test_output_flushes_before_reading():
+    stream = StringIO()
+    output = Output(stream)
+    output.print('screen')
+    with patch('builtins.input', side_effect=lambda prompt: stream.getvalue() + prompt) as mocked_input:
+        assert output.read('? ') == 'screen\n? '
+    mocked_input.assert_called_once_with('? ')
+
+
+def test_output_defaults_to_stdout(capsys):
+    output = Output()
+    output.print('hello')
+    output.flush()
+    assert capsys.readouterr().out == 'hello\n'
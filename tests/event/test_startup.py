@@ -0,0 +1,17 @@
+import pytest
+
+from benchmarks.bench_import import import_times
+
+
+@pytest.mark.parametrize('module', ['event.app', 'event.cli'])
+def test_startup_mode_defers_heavy_imports(module):
+    times = import_times(module, typecheck=False)
+    assert module in times
+    for heavy in ('requests', 'urllib3', 'typeguard', 'dataclass_type_validator'):
+        assert heavy not in times
+
+
+def test_startup_mode_is_faster_than_typechecked_mode():
+    typechecked = import_times('event.cli', typecheck=True)
+    assert 'typeguard' in typechecked
+    assert import_times('event.cli', typecheck=False)['event.cli'] < typechecked['event.cli']
@@ -0,0 +1,111 @@
+import io
+import json
+from datetime import datetime
+
+import pytest
+from valid8 import ValidationError
+
+from event.api import ApiClient, ApiConfig
+from event.domain import Name, Description, Author, Date, Location, Category, Priority, Event
+from event.transfer import TSV_HEADER, Importer, export_tsv, export_jsonl, read_tsv, read_jsonl
+from benchmarks.fake_api import FakeApi
+
+
+def new_event(name='nuovo'):
+    return Event(-1, Name(name), Description('descr'), Author(1), Date(datetime(2099, 1, 1, 10)),
+                 Date(datetime(2099, 1, 2, 10)), Location('casa'), Category(1), Priority(2))
+
+
+def make_importer(api, **kwargs):
+    client = ApiClient(ApiConfig(api.url, retries=0))
+    client.authenticate(api.key)
+    return Importer(client, **kwargs)
+
+
+def test_export_tsv_matches_event_str_layout():
+    file = io.StringIO()
+    assert export_tsv([new_event('primo'), new_event('secondo')], file) == 2
+    lines = file.getvalue().splitlines()
+    assert lines[0] == TSV_HEADER
+    assert lines[1] == str(new_event('primo')).splitlines()[1]
+    assert len(lines) == 3
+
+
+def test_tsv_round_trip():
+    file = io.StringIO()
+    export_tsv([new_event('primo'), new_event('secondo')], file)
+    file.seek(0)
+    rows = list(read_tsv(file, 1))
+    assert [number for number, _ in rows] == [2, 3]
+    assert [event.name for _, event in rows] == [Name('primo'), Name('secondo')]
+    assert rows[0][1].start_date == Date(datetime(2099, 1, 1, 10))
+
+
+def test_jsonl_round_trip():
+    file = io.StringIO()
+    assert export_jsonl([new_event('primo')], file) == 1
+    assert json.loads(file.getvalue())['name'] == 'primo'
+    file.seek(0)
+    (number, event), = read_jsonl(file, 7)
+    assert number == 1
+    assert event.author == Author(7)
+    assert event.end_date == Date(datetime(2099, 1, 2, 10))
+
+
+def test_read_tsv_reports_bad_rows_without_aborting():
+    file = io.StringIO(TSV_HEADER + '\n'
+                       'a\tb\t2099-01-01 10:00:00\t2099-01-02 10:00:00\tcasa\t1\t2\n'
+                       'a\tb\tnot a date\t2099-01-02 10:00:00\tcasa\t1\t2\n'
+                       'a\tb\t2099-01-01 10:00:00\n'
+                       'a\tb\t2099-01-01 10:00:00\t2099-01-02 10:00:00\tcasa\t1\t9\n'
+                       '\n'
+                       'c\td\t2099-01-01 10:00:00\t2099-01-02 10:00:00\tcasa\t0\t0\n')
+    rows = list(read_tsv(file, 1))
+    assert [number for number, _ in rows] == [2, 3, 4, 5, 7]
+    assert [isinstance(parsed, Event) for _, parsed in rows] == [True, False, False, False, True]
+    assert isinstance(rows[3][1], ValidationError)
+
+
+def test_read_jsonl_reports_missing_fields():
+    file = io.StringIO('{"name": "a"}\nnot json\n')
+    rows = list(read_jsonl(file, 1))
+    assert isinstance(rows[0][1], KeyError)
+    assert isinstance(rows[1][1], ValueError)
+
+
+def test_importer_validates_chunk_size():
+    with pytest.raises(ValidationError):
+        Importer(ApiClient(), chunk_size=0)
+
+
+def test_importer_uploads_valid_rows_and_collects_errors():
+    file = io.StringIO()
+    export_tsv([new_event(f'evento {i}') for i in range(5)], file)
+    file.write('x\ty\tnot a date\t2099-01-02 10:00:00\tcasa\t1\t2\n')
+    file.seek(0)
+    with FakeApi() as api:
+        report = make_importer(api, chunk_size=2).import_tsv(file, 1)
+    assert report.imported == 5
+    assert report.failed == 1
+    assert report.errors[0].line == 7
+    assert api.requests.count('POST /') == 5
+    assert sorted(e['name'] for e in api.events) == [f'evento {i}' for i in range(5)]
+
+
+def test_importer_reports_server_rejections():
+    file = io.StringIO()
+    export_jsonl([new_event()], file)
+    file.seek(0)
+    with FakeApi(key='other') as api:
+        client = ApiClient(ApiConfig(api.url, retries=0))
+        client.authenticate('wrong')
+        report = Importer(client).import_jsonl(file, 1)
+    assert report.imported == 0
+    assert report.errors[0].message == 'Server answered 401'
+
+
+def test_importer_caps_stored_errors():
+    rows = ((number, ValueError('bad')) for number in range(1, 101))
+    report = Importer(ApiClient(), chunk_size=7, max_errors=3).run(rows)
+    assert report.failed == 100
+    assert [error.line for error in report.errors] == [1, 2, 3]
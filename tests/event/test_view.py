@@ -0,0 +1,70 @@
+from unittest.mock import patch
+
+import pytest
+from valid8 import ValidationError
+
+from event.domain import Event, ToDoList
+from event.view import ListView, HEADER
+from benchmarks.fake_api import make_events
+
+
+def make_list(n, compact=False):
+    toDoList = ToDoList(compact)
+    toDoList.upsert_rows(make_events(n))
+    return toDoList
+
+
+def test_page_size_must_be_positive():
+    with pytest.raises(ValidationError):
+        ListView(0)
+
+
+def test_rows_only_cover_the_visible_window():
+    toDoList = make_list(25)
+    view = ListView(10)
+    assert view.pages(toDoList) == 3
+    assert len(view.rows(toDoList)) == 10
+    assert view.rows(toDoList)[0].split()[:3] == ['1', 'Evento', '1']
+    view.jump(toDoList, 2)
+    rows = view.rows(toDoList)
+    assert len(rows) == 5
+    assert rows[0].split()[:3] == ['21', 'Evento', '21']
+
+
+def test_navigation_is_clamped():
+    toDoList = make_list(25)
+    view = ListView(10)
+    assert view.prev(toDoList) == 0
+    assert view.next(toDoList) == 1
+    assert view.next(toDoList) == 2
+    assert view.next(toDoList) == 2
+    assert view.jump(toDoList, 99) == 2
+    toDoList.remove_many(range(1, 20))
+    assert view.rows(toDoList)[0].split()[0] == '1'
+    assert view.page == 0
+
+
+def test_empty_list_has_one_page():
+    view = ListView(10)
+    assert view.pages(ToDoList()) == 1
+    assert view.render(ToDoList()).splitlines()[1] == HEADER
+    assert view.render(ToDoList()).endswith('Page 1/1 (0 events)')
+
+
+@pytest.mark.parametrize('compact', [False, True])
+def test_rows_are_formatted_once_per_event(compact):
+    toDoList = make_list(25, compact)
+    view = ListView(10)
+    view.rows(toDoList)
+    with patch('event.view.ROW_FORMAT', '%s|%s|%s|%s|%s|%s|%s|%s'):
+        assert view.rows(toDoList)[0].split()[:3] == ['1', 'Evento', '1']
+        view.jump(toDoList, 1)
+        assert '|' in view.rows(toDoList)[0]
+
+
+def test_changed_events_are_reformatted():
+    toDoList = make_list(3)
+    view = ListView(10)
+    assert 'Evento 1' in view.rows(toDoList)[0]
+    toDoList.upsert_event(Event.from_trusted_dict(dict(make_events(1)[0], name='Cambiato')))
+    assert 'Cambiato' in '\n'.join(view.rows(toDoList))
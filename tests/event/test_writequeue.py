@@ -0,0 +1,128 @@
+import threading
+import time
+from datetime import datetime
+from unittest.mock import Mock
+
+import pytest
+from valid8 import ValidationError
+
+from event.api import ApiClient, ApiConfig
+from event.domain import Name, Description, Author, Date, Location, Category, Priority, Event, ToDoList
+from event.writequeue import WriteQueue, CREATE, DELETE
+from benchmarks.fake_api import FakeApi, make_events
+
+
+def new_event(name='nuovo'):
+    return Event(-1, Name(name), Description('descr'), Author(1), Date(datetime(2099, 1, 1, 10)),
+                 Date(datetime(2099, 1, 2, 10)), Location('casa'), Category(1), Priority(2))
+
+
+def make_queue(api, toDoList, **kwargs):
+    client = ApiClient(ApiConfig(api.url, retries=0))
+    client.authenticate(api.key)
+    return WriteQueue(client, lambda: toDoList, **kwargs)
+
+
+def test_batch_size_must_be_positive():
+    with pytest.raises(ValidationError):
+        WriteQueue(ApiClient(), lambda: ToDoList(), batch_size=0)
+
+
+def test_creates_are_applied_optimistically_and_flushed_in_batch():
+    toDoList = ToDoList()
+    with FakeApi(delay=0.05) as api:
+        queue = make_queue(api, toDoList, batch_size=3, flush_interval=None)
+        first = queue.create(new_event('primo'))
+        second = queue.create(new_event('secondo'))
+        assert first.id < 0 and second.id < 0 and first.id != second.id
+        assert toDoList.events() == 2
+        assert api.requests == []
+        queue.create(new_event('terzo'))
+        assert queue.pending() == 0
+    assert api.requests.count('POST /') == 3
+    assert api.max_active > 1
+    assert sorted(event.id for event in toDoList.in_insertion_order()) == [1, 2, 3]
+
+
+def test_delete_of_pending_create_is_coalesced():
+    toDoList = ToDoList()
+    with FakeApi() as api:
+        queue = make_queue(api, toDoList, flush_interval=None)
+        event = queue.create(new_event())
+        queue.delete(event)
+        assert toDoList.events() == 0
+        assert queue.pending() == 0
+        assert queue.flush() == []
+    assert api.requests == []
+
+
+def test_delete_of_in_flight_create_targets_the_real_id():
+    toDoList = ToDoList()
+    with FakeApi(delay=0.2) as api:
+        queue = make_queue(api, toDoList, batch_size=1, flush_interval=None)
+        creator = threading.Thread(target=queue.create, args=(new_event(),))
+        creator.start()
+        time.sleep(0.1)
+        queue.delete(toDoList.get_by_id(-1))
+        creator.join()
+        assert queue.pending() == 0
+    assert api.requests == ['POST /', 'DELETE /1/']
+    assert toDoList.events() == 0
+    assert api.events == []
+
+
+def test_deletes_are_flushed_on_timer():
+    toDoList = ToDoList()
+    toDoList.upsert_rows(make_events(2))
+    with FakeApi(make_events(2)) as api:
+        queue = make_queue(api, toDoList, flush_interval=0.05)
+        queue.delete(toDoList.get_by_id(1))
+        assert not toDoList.contains(1)
+        time.sleep(0.3)
+        assert queue.pending() == 0
+    assert api.requests == ['DELETE /1/']
+    assert [item['id'] for item in api.events] == [2]
+
+
+def test_failures_are_rolled_back():
+    toDoList = ToDoList()
+    toDoList.upsert_rows(make_events(1))
+    failed = []
+    with FakeApi(make_events(1)) as api:
+        queue = make_queue(api, toDoList, flush_interval=None, on_failure=failed.append)
+        queue.create(new_event())
+        queue.delete(toDoList.get_by_id(1))
+        api.key = 'rotated'
+        failures = queue.flush()
+    assert [write.kind for write in failures] == [CREATE, DELETE]
+    assert failures == failed
+    assert [event.id for event in toDoList.in_insertion_order()] == [1]
+
+
+def test_create_without_id_in_reply_drops_temporary_event_and_resyncs():
+    toDoList = ToDoList()
+    api = Mock(spec=ApiClient)
+    api.create_event.return_value = Mock(status_code=201, json=Mock(return_value={}))
+    resyncs = []
+    queue = WriteQueue(api, lambda: toDoList, flush_interval=None, on_resync=lambda: resyncs.append(True))
+    queue.create(new_event())
+    assert queue.flush() == []
+    assert toDoList.events() == 0
+    assert resyncs == [True]
+
+
+def test_flush_applies_changes_under_the_shared_lock():
+    toDoList = ToDoList()
+    toDoList.upsert_rows(make_events(1))
+    lock = threading.RLock()
+    with FakeApi(make_events(1)) as api:
+        queue = make_queue(api, toDoList, flush_interval=None, lock=lock)
+        queue.delete(toDoList.get_by_id(1))
+        api.key = 'rotated'
+        with lock:
+            flusher = threading.Thread(target=queue.flush)
+            flusher.start()
+            time.sleep(0.2)
+            assert not toDoList.contains(1)
+        flusher.join()
+    assert toDoList.contains(1)
@@ -1,4 +1,5 @@
 from dataclasses import dataclass
+from typing import List, Optional
 
 import pytest
 
@@ -25,4 +26,23 @@ def test_validate_dataclass_using_post_init():
 
     Foo('ok')
     with pytest.raises(TypeError):
-        Foo(1)
\ No newline at end of file
+        Foo(1)
+
+def test_validate_dataclass_with_generic_fields():
+    @dataclass()
+    class Foo:
+        bar: List[str]
+
+    validate_dataclass(Foo(['ok']))
+    with pytest.raises(TypeError):
+        validate_dataclass(Foo([1]))
+
+
+def test_validate_dataclass_with_optional_fields():
+    @dataclass()
+    class Foo:
+        bar: Optional[str]
+
+    validate_dataclass(Foo(None))
+    with pytest.raises(TypeError):
+        validate_dataclass(Foo(1))
@@ -0,0 +1,70 @@
+from dataclasses import dataclass
+from datetime import datetime
+
+import pytest
+from valid8 import ValidationError
+
+from event.domain import Name, Date, Category, Event
+from event.menu import Key
+from validation.dataclasses import validate_dataclass
+from validation.levels import FULL, BOUNDARY, OFF, boundary, enabled, level, set_level, validation_level
+
+
+@dataclass
+class Foo:
+    bar: str
+
+
+def test_default_level_is_full():
+    assert level() == FULL
+    assert enabled()
+
+
+def test_unknown_level_is_rejected():
+    with pytest.raises(ValidationError):
+        set_level('some')
+    with pytest.raises(ValidationError):
+        with validation_level('some'):
+            pass
+
+
+def test_off_skips_every_check():
+    with validation_level(OFF):
+        validate_dataclass(Foo(1))
+        assert Category(9).value == 9
+        with boundary():
+            assert Name('#').value == '#'
+    with pytest.raises(ValidationError):
+        Category(9)
+
+
+def test_boundary_checks_only_inside_boundaries():
+    with validation_level(BOUNDARY):
+        assert not enabled()
+        assert Key('*').value == '*'
+        assert Date(datetime(2010, 1, 1)).date == datetime(2010, 1, 1)
+        with boundary():
+            assert enabled()
+            with pytest.raises(TypeError):
+                validate_dataclass(Foo(1))
+            with pytest.raises(ValidationError):
+                Category(9)
+        assert not enabled()
+
+
+def test_set_level_changes_the_default():
+    try:
+        set_level(OFF)
+        assert not enabled()
+        with validation_level(FULL):
+            assert enabled()
+    finally:
+        set_level(FULL)
+
+
+def test_server_rows_are_still_checked_at_boundary_level():
+    row = {'id': 1, 'name': '#', 'description': 'b', 'author': 1, 'start_date': '2099-01-01T10:00:00Z',
+           'end_date': '2099-01-02T10:00:00Z', 'location': 'c', 'category': 1, 'priority': 1}
+    with validation_level(BOUNDARY):
+        with pytest.raises(ValidationError):
+            Event.from_trusted_dict(row)
@@ -0,0 +1,49 @@
+from dataclasses import dataclass
+from typing import Callable, List, Optional
+
+from validation.registry import ValidatorRegistry, CacheStats
+
+
+def test_compiled_is_memoized_by_regex():
+    registry = ValidatorRegistry()
+    assert registry.compiled(r'\d+') is registry.compiled(r'\d+')
+    assert registry.stats()['regexes'] == CacheStats(hits=1, misses=1)
+
+
+def test_pattern_is_memoized_by_regex():
+    registry = ValidatorRegistry()
+    is_int = registry.pattern(r'\d+')
+    assert is_int is registry.pattern(r'\d+')
+    assert is_int('12')
+    assert not is_int('a')
+    assert is_int.__name__ == r'pattern(\d+)'
+    assert registry.stats()['patterns'] == CacheStats(hits=1, misses=1)
+
+
+def test_type_plan_is_memoized_by_class():
+    @dataclass()
+    class Foo:
+        bar: str
+        baz: Optional[int]
+        qux: Callable[[], None]
+
+    registry = ValidatorRegistry()
+    plan = registry.type_plan(Foo)
+    assert [name for name, _, _ in plan] == ['bar', 'baz', 'qux']
+    assert registry.type_plan(Foo) is plan
+    assert registry.stats()['plans'] == CacheStats(hits=1, misses=1)
+
+
+def test_type_plan_falls_back_on_generic_containers():
+    @dataclass()
+    class Foo:
+        bar: List[str]
+
+    assert ValidatorRegistry().type_plan(Foo) is None
+
+
+def test_clear_resets_caches_and_counters():
+    registry = ValidatorRegistry()
+    registry.compiled(r'\d+')
+    registry.clear()
+    assert registry.stats()['regexes'] == CacheStats()
@@ -1,8 +1,20 @@
-from dataclass_type_validator import dataclass_type_validator, TypeValidationError
+from validation.levels import enabled
+from validation.registry import registry
 
 
 def validate_dataclass(data):
-    try:
-        dataclass_type_validator(data)
-    except TypeValidationError as e:
-        raise TypeError(e)
+    if not enabled():
+        return
+    plan = registry.type_plan(type(data))
+    if plan is None:
+        from dataclass_type_validator import dataclass_type_validator, TypeValidationError
+        try:
+            dataclass_type_validator(data)
+        except TypeValidationError as e:
+            raise TypeError(e)
+        return
+    for name, expected, check in plan:
+        value = getattr(data, name)
+        if not check(value):
+            raise TypeError(f'{type(data).__name__}.{name} must be an instance of {expected}, '
+                            f'but received {type(value)}')
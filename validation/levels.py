@@ -0,0 +1,51 @@
+import os
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+from valid8 import validate
+
+FULL = 'full'
+BOUNDARY = 'boundary'
+OFF = 'off'
+LEVELS = (FULL, BOUNDARY, OFF)
+ENVIRONMENT_VARIABLE = 'TODOLIST_VALIDATION'
+
+_default = [os.environ.get(ENVIRONMENT_VARIABLE, FULL).strip().lower()]
+validate(ENVIRONMENT_VARIABLE, _default[0], is_in=LEVELS)
+_level: ContextVar[Optional[str]] = ContextVar('validation_level', default=None)
+_at_boundary: ContextVar[bool] = ContextVar('validation_boundary', default=False)
+
+
+def level() -> str:
+    res = _level.get()
+    return res if res is not None else _default[0]
+
+
+def set_level(value: str) -> None:
+    validate('level', value, is_in=LEVELS)
+    _default[0] = value
+
+
+@contextmanager
+def validation_level(value: str) -> Iterator[str]:
+    validate('level', value, is_in=LEVELS)
+    token = _level.set(value)
+    try:
+        yield value
+    finally:
+        _level.reset(token)
+
+
+@contextmanager
+def boundary() -> Iterator[None]:
+    token = _at_boundary.set(True)
+    try:
+        yield
+    finally:
+        _at_boundary.reset(token)
+
+
+def enabled() -> bool:
+    current = level()
+    return current == FULL or (current == BOUNDARY and _at_boundary.get())
@@ -0,0 +1,87 @@
+import collections.abc
+import dataclasses
+import re
+import typing
+import weakref
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Pattern, Tuple
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+
+
+def _checker(expected: Any) -> Optional[Callable[[Any], bool]]:
+    if expected is Any:
+        return lambda value: True
+    if isinstance(expected, type):
+        return lambda value: isinstance(value, expected)
+    origin = typing.get_origin(expected)
+    if origin is typing.Union:
+        args = typing.get_args(expected)
+        if all(isinstance(arg, type) for arg in args):
+            return lambda value: isinstance(value, args)
+    if origin is collections.abc.Callable:
+        return callable
+    return None
+
+
+class ValidatorRegistry:
+    def __init__(self):
+        self.__regexes: Dict[str, Pattern] = {}
+        self.__patterns: Dict[str, Callable[[str], bool]] = {}
+        self.__plans = weakref.WeakKeyDictionary()
+        self.__stats = {'regexes': CacheStats(), 'patterns': CacheStats(), 'plans': CacheStats()}
+
+    def __lookup(self, cache, kind: str, key: Any, build: Callable[[], Any]) -> Any:
+        stats = self.__stats[kind]
+        try:
+            res = cache[key]
+            stats.hits += 1
+        except KeyError:
+            stats.misses += 1
+            res = cache[key] = build()
+        return res
+
+    def compiled(self, regex: str) -> Pattern:
+        return self.__lookup(self.__regexes, 'regexes', regex, lambda: re.compile(regex))
+
+    def pattern(self, regex: str) -> Callable[[str], bool]:
+        def build():
+            fullmatch = self.compiled(regex).fullmatch
+
+            def res(value):
+                return bool(fullmatch(value))
+            res.__name__ = f'pattern({regex})'
+            return res
+        return self.__lookup(self.__patterns, 'patterns', regex, build)
+
+    def type_plan(self, cls: type) -> Optional[Tuple[Tuple[str, Any, Callable[[Any], bool]], ...]]:
+        def build():
+            try:
+                hints = typing.get_type_hints(cls)
+            except (NameError, TypeError):
+                return None
+            plan = []
+            for field in dataclasses.fields(cls):
+                check = _checker(hints.get(field.name, Any))
+                if check is None:
+                    return None
+                plan.append((field.name, hints.get(field.name, Any), check))
+            return tuple(plan)
+        return self.__lookup(self.__plans, 'plans', cls, build)
+
+    def stats(self) -> Dict[str, CacheStats]:
+        return {kind: dataclasses.replace(stats) for kind, stats in self.__stats.items()}
+
+    def clear(self) -> None:
+        self.__regexes.clear()
+        self.__patterns.clear()
+        self.__plans.clear()
+        for stats in self.__stats.values():
+            stats.hits = stats.misses = 0
+
+
+registry = ValidatorRegistry()
@@ -0,0 +1,14 @@
+import os
+from typing import Any, Callable, Optional
+
+ENVIRONMENT_VARIABLE = 'TODOLIST_TYPECHECK'
+enabled = os.environ.get(ENVIRONMENT_VARIABLE, '1').strip().lower() not in ('0', 'false', 'no', 'off')
+
+if enabled:
+    from typeguard import typechecked, typeguard_ignore
+else:
+    def typechecked(target: Optional[Any] = None, **kwargs: Any) -> Any:
+        return target if target is not None else lambda res: res
+
+    def typeguard_ignore(target: Callable) -> Callable:
+        return target